@@ -45,4 +45,48 @@ export async function getMonthlySummary(month) {
     // If no month is provided, the backend will default to current month
     const query = month ? `?month=${month}` : "";
     return apiRequest(`/api/summary${query}`);
-}
\ No newline at end of file
+}
+/**
+ * Fetches per-month totals for a range of months in one request.
+ * @param {string} from - Format: "YYYY-MM"
+ * @param {string} to - Format: "YYYY-MM"
+ */
+export async function getSummaryTrends(from, to) {
+    const params = new URLSearchParams();
+    if (from) params.set("from", from);
+    if (to) params.set("to", to);
+    const query = params.toString() ? `?${params}` : "";
+    return apiRequest(`/api/summary/trends${query}`);
+}
+
+/**
+ * Applies the same category/amount change to many transactions at once.
+ * @param {object} payload - { ids: [...] } or { filter: { template, text_contains, category } },
+ *                           plus { category, amount }
+ */
+export async function bulkUpdateSMS(payload) {
+    return apiRequest("/api/sms/bulk", {
+        method: "PATCH",
+        headers: {
+            "Content-Type": "application/json",
+        },
+        body: JSON.stringify(payload),
+    });
+}
+
+/**
+ * Fetches precomputed recurring payments and unusual transactions.
+ * Returns { recurring: [], anomalies: [], computed_at, stale }
+ */
+export async function getInsights() {
+    return apiRequest("/api/insights");
+}
+
+/**
+ * Fetches the top merchants by spend.
+ * @param {object} params - { from: "YYYY-MM", to: "YYYY-MM", limit: 10 }
+ */
+export async function getMerchantSummary(params = {}) {
+    const query = new URLSearchParams(params).toString();
+    return apiRequest(`/api/summary/merchants${query ? `?${query}` : ""}`);
+}
@@ -0,0 +1,8 @@
+# src/expense_auditor/__main__.py
+# `python -m expense_auditor` runs the dev server. Prefer it over
+# `python -m expense_auditor.app`: multiprocessing skips re-importing a package
+# __main__ in the password-hashing workers, so they don't load the whole app.
+from expense_auditor.app import app
+
+if __name__ == "__main__":
+    app.run(debug=True, host="0.0.0.0", port=5000)
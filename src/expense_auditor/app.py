@@ -1,9 +1,15 @@
 from flask import Flask, request, jsonify, make_response, abort
-from expense_auditor.db import init_db, SessionLocal, SMSMessage, User, UserSettings
+from expense_auditor.db import init_db, SessionLocal, SMSMessage, User, UserSettings, UserInsight
 from expense_auditor.sms_classifier import classify_sms_with_confidence, load_model
 from expense_auditor.utils.amount_extractor import extract_amount
-from expense_auditor.auth_utils import verify_password, make_token, hash_password
+from expense_auditor.utils.sms_template import template_like_pattern, exact_template
+from expense_auditor.utils.merchant_extractor import extract_merchants
+from expense_auditor.auth_utils import (
+    pooled_verify_password, pooled_hash_password, needs_rehash, make_token, HashPoolBusy,
+    start_hash_pool,
+)
 import csv
+import json
 from io import TextIOWrapper
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy import extract, func
@@ -11,6 +17,7 @@ from flask_cors import CORS
 from datetime import datetime
 from dateutil.parser import parse as parse_date
 from expense_auditor.train_classifier import train_and_save
+from expense_auditor.trends import parse_month, month_bounds, monthly_trends, MAX_MONTHS
 
 app = Flask(__name__)
 
@@ -19,13 +26,15 @@ CORS(
     app,
     resources={r"/*": {
         "origins": ["http://localhost:5173", "http://127.0.0.1:5173"],
-        "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+        "methods": ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
         "allow_headers": ["Authorization", "Content-Type"],
         "supports_credentials": True
     }}
 )
 
 init_db()
+# Spawn the bcrypt workers now so the first login doesn't pay for it
+start_hash_pool()
 
 # --- Auth Helper ---
 def require_auth(session):
@@ -35,6 +44,35 @@ def require_auth(session):
     token = auth.replace("Bearer ", "").strip()
     return session.query(User).filter(User.token == token).first()
 
+def busy_response():
+    # Password hashing pool saturated: shed load instead of queueing forever
+    resp = jsonify({"error": "Server busy, please retry"})
+    resp.headers["Retry-After"] = "1"
+    return resp, 503
+
+def bump_data_version(session, user):
+    # Invalidates cached summaries/trends for this user.
+    # Incremented in SQL so concurrent writers never commit the same version.
+    session.query(User).filter(User.id == user.id).update(
+        {User.data_version: User.data_version + 1}, synchronize_session=False
+    )
+
+RETRAIN_AFTER = 5
+BULK_CHUNK = 900  # stay under SQLite's bound-parameter limit
+
+def record_corrections(session, user, count):
+    # Incremented in SQL, like bump_data_version, so concurrent corrections add up
+    if count:
+        session.query(UserSettings).filter(UserSettings.user_id == user.id).update(
+            {UserSettings.pending_corrections: UserSettings.pending_corrections + count},
+            synchronize_session=False
+        )
+
+def maybe_auto_retrain(settings):
+    # Retrain if this user has 5+ manual corrections since the last retrain
+    if settings and settings.auto_retrain and (settings.pending_corrections or 0) >= RETRAIN_AFTER:
+        train_and_save()
+
 # --- API Routes ---
 
 @app.route("/health", methods=["GET"])
@@ -63,7 +101,7 @@ def signup():
         # Create new user
         new_user = User(
             email=email,
-            password_hash=hash_password(password), # Uses your auth_utils
+            password_hash=pooled_hash_password(password), # Hashed off-thread (auth_utils pool)
             token=make_token(),
             is_admin=False # Default to standard user
         )
@@ -79,6 +117,9 @@ def signup():
             "token": new_user.token,
             "message": "Account created successfully"
         }), 201
+    except HashPoolBusy:
+        session.rollback()
+        return busy_response()
     except Exception as e:
         session.rollback()
         return jsonify({"error": str(e)}), 500
@@ -94,12 +135,25 @@ def login():
     session = SessionLocal()
     try:
         user = session.query(User).filter(User.email == email).first()
-        if not user or not verify_password(password, user.password_hash):
+        if not user or not pooled_verify_password(password, user.password_hash):
             return jsonify({"error": "Invalid credentials"}), 401
+
+        changed = False
+        if needs_rehash(user.password_hash):
+            # Upgrade to the configured cost; skipped (not failed) if the pool is busy
+            try:
+                user.password_hash = pooled_hash_password(password)
+                changed = True
+            except HashPoolBusy:
+                pass
         if not user.token:
             user.token = make_token()
+            changed = True
+        if changed:
             session.commit()
         return jsonify({"token": user.token, "is_admin": user.is_admin})
+    except HashPoolBusy:
+        return busy_response()
     finally:
         session.close()
 
@@ -119,11 +173,17 @@ def upload_sms_csv():
         stream = TextIOWrapper(file.stream, encoding="utf-8-sig")
         reader = csv.DictReader(stream)
 
-        inserted = 0
+        texts = []
         for row in reader:
             text = list(row.values())[0] # Fallback for your specific CSV
             if not text or not text.strip(): continue
+            texts.append(text)
+
+        # Merchant extraction runs once over the whole file
+        merchants = extract_merchants(texts)
 
+        inserted = 0
+        for text, merchant in zip(texts, merchants):
             category, confidence = classify_sms_with_confidence(text)
             
             # If AI is below threshold, it's NOT 'corrected' (needs review)
@@ -134,12 +194,15 @@ def upload_sms_csv():
                 text=text.strip(),
                 amount=extract_amount(text),
                 category=category,
+                merchant=merchant,
                 confidence=confidence,
                 corrected=not is_low_confidence # False if low confidence
             )
             session.add(sms)
             inserted += 1
 
+        if inserted:
+            bump_data_version(session, user)
         session.commit()
         return jsonify({"inserted": inserted})
     finally:
@@ -160,6 +223,7 @@ def list_sms():
                 "text": m.text, 
                 "amount": m.amount, 
                 "category": m.category,
+                "merchant": m.merchant,
                 "confidence": m.confidence or 0.0, # FIXED: Prevent NaN
                 "corrected": m.corrected,          # FIXED: For Dashboard highlighting
                 "created_at": m.created_at.isoformat()
@@ -186,20 +250,102 @@ def update_sms_item(sms_id):
         sms.amount = data.get("amount", sms.amount)
         sms.corrected = True # User verified it
         sms.confidence = 1.0 # Manual verification is 100% sure
+        bump_data_version(session, user)
+        record_corrections(session, user, 1)
         
         session.commit()
 
         # AUTO-RETRAIN TRIGGER
-        if settings and settings.auto_retrain:
-            # Retrain if there are 5+ new manual corrections
-            new_corrections = session.query(SMSMessage).filter_by(corrected=True).count()
-            if new_corrections >= 5:
-                train_and_save()
+        maybe_auto_retrain(settings)
 
         return jsonify({"status": "success"})
     finally:
         session.close()
 
+@app.route("/api/sms/bulk", methods=["PATCH", "OPTIONS"])
+def bulk_update_sms():
+    """
+    Body: {"ids": [...]} or {"filter": {"template": ..., "text_contains": ..., "category": ...}}
+    plus the changes: "category" and/or "amount".
+    Applied as set-based UPDATEs in a single transaction.
+    """
+    if request.method == "OPTIONS": return jsonify({}), 200
+    session = SessionLocal()
+    try:
+        user = require_auth(session)
+        if not user: return jsonify({"error": "Unauthorized"}), 401
+
+        data = request.get_json(silent=True)
+        if not data: return jsonify({"error": "Invalid JSON"}), 400
+
+        changes = {k: data[k] for k in ("category", "amount") if k in data}
+        if not changes:
+            return jsonify({"error": "Nothing to update: provide category and/or amount"}), 400
+        if "category" in changes and (not isinstance(changes["category"], str) or not changes["category"].strip()):
+            return jsonify({"error": "'category' must be a non-empty string"}), 400
+        if "amount" in changes and (isinstance(changes["amount"], bool) or not isinstance(changes["amount"], (int, float))):
+            return jsonify({"error": "'amount' must be a number"}), 400
+        changes.update({"corrected": True, "confidence": 1.0, "updated_at": datetime.utcnow()})
+
+        ids = data.get("ids")
+        filters = data.get("filter")
+        if (ids is None) == (filters is None):
+            return jsonify({"error": "Provide exactly one of 'ids' or 'filter'"}), 400
+
+        base = [SMSMessage.user_id == user.id]
+        if filters is not None:
+            if not isinstance(filters, dict) or not filters:
+                return jsonify({"error": "Filter must be a non-empty object"}), 400
+            unknown = set(filters) - {"template", "text_contains", "category"}
+            if unknown:
+                return jsonify({"error": f"Unknown filter: {', '.join(sorted(unknown))}"}), 400
+            if not all(isinstance(v, str) and v.strip() for v in filters.values()):
+                return jsonify({"error": "Filter values must be non-empty strings"}), 400
+
+            if "text_contains" in filters:
+                base.append(SMSMessage.text.contains(filters["text_contains"], autoescape=True))
+            if "category" in filters:
+                base.append(SMSMessage.category == filters["category"])
+
+            if "template" in filters:
+                # LIKE narrows the candidates; the exact template check decides
+                key = exact_template(filters["template"])
+                candidates = session.query(SMSMessage.id, SMSMessage.text).filter(
+                    *base, SMSMessage.text.like(template_like_pattern(filters["template"]), escape="\\")
+                )
+                ids = [i for i, text in candidates if exact_template(text) == key]
+            else:
+                batches = [base]
+
+        if ids is not None:
+            if not isinstance(ids, list) or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+                return jsonify({"error": "'ids' must be a list of integers"}), 400
+            batches = [
+                base + [SMSMessage.id.in_(ids[i:i + BULK_CHUNK])]
+                for i in range(0, len(ids), BULK_CHUNK)
+            ]
+
+        updated = 0
+        for criteria in batches:
+            updated += session.query(SMSMessage).filter(*criteria).update(
+                changes, synchronize_session=False
+            )
+
+        if updated:
+            bump_data_version(session, user)
+            record_corrections(session, user, updated)
+        session.commit()
+
+        settings = session.query(UserSettings).filter_by(user_id=user.id).first()
+        maybe_auto_retrain(settings)
+
+        return jsonify({"updated": updated})
+    except IntegrityError:
+        session.rollback()
+        return jsonify({"error": "Update would create duplicate messages"}), 409
+    finally:
+        session.close()
+
 @app.route("/api/model/status", methods=["GET", "OPTIONS"])
 def model_status_route():
     if request.method == "OPTIONS": return jsonify({}), 200
@@ -316,10 +462,119 @@ def monthly_summary():
                 
         return jsonify(summary)
         
-    except Exception as e:
-        print(f"Summary Error: {e}")
+    except Exception:
+        # Same format as Flask's unhandled-exception log (parsed by loadtest)
+        app.logger.exception("Exception on %s [%s]", request.path, request.method)
+        return jsonify({"error": "Internal Server Error"}), 500
+    finally:
+        session.close()
+
+@app.route("/api/summary/trends", methods=["GET", "OPTIONS"])
+def summary_trends():
+    if request.method == "OPTIONS":
+        return jsonify({"status": "ok"}), 200
+
+    session = SessionLocal()
+    try:
+        user = require_auth(session)
+        if not user:
+            return jsonify({"error": "Unauthorized"}), 401
+
+        # Defaults to the last 12 months ending with the current month
+        now = datetime.now()
+        end = parse_month(request.args.get("to", f"{now.year}-{now.month:02d}"))
+        from_year, from_month = divmod(now.year * 12 + now.month - 12, 12)
+        default_from = f"{from_year}-{from_month + 1:02d}"
+        start = parse_month(request.args.get("from", default_from))
+
+        if not start or not end:
+            return jsonify({"error": "Months must be in YYYY-MM format"}), 400
+        if start > end:
+            return jsonify({"error": "'from' must not be after 'to'"}), 400
+        if (end[0] - start[0]) * 12 + (end[1] - start[1]) + 1 > MAX_MONTHS:
+            return jsonify({"error": f"Range is limited to {MAX_MONTHS} months"}), 400
+
+        months = monthly_trends(session, user, start, end)
+        return jsonify({"months": months})
+
+    except Exception:
+        # Same format as Flask's unhandled-exception log (parsed by loadtest)
+        app.logger.exception("Exception on %s [%s]", request.path, request.method)
+        return jsonify({"error": "Internal Server Error"}), 500
+    finally:
+        session.close()
+@app.route("/api/summary/merchants", methods=["GET", "OPTIONS"])
+def merchant_summary():
+    if request.method == "OPTIONS":
+        return jsonify({"status": "ok"}), 200
+
+    session = SessionLocal()
+    try:
+        user = require_auth(session)
+        if not user:
+            return jsonify({"error": "Unauthorized"}), 401
+
+        # Defaults to the current month; from/to accept YYYY-MM like /api/summary/trends
+        now = datetime.now()
+        current = f"{now.year}-{now.month:02d}"
+        start = parse_month(request.args.get("from", request.args.get("month", current)))
+        end = parse_month(request.args.get("to", request.args.get("month", current)))
+        if not start or not end or start > end:
+            return jsonify({"error": "Months must be in YYYY-MM format, 'from' <= 'to'"}), 400
+
+        try:
+            limit = min(max(int(request.args.get("limit", 10)), 1), 100)
+        except ValueError:
+            return jsonify({"error": "limit must be an integer"}), 400
+
+        lower, upper = month_bounds(start, end)
+        total = func.sum(SMSMessage.amount)
+
+        rows = session.query(
+            SMSMessage.merchant,
+            total,
+            func.count(SMSMessage.id)
+        ).filter(
+            SMSMessage.user_id == user.id,
+            SMSMessage.category == "Expense",
+            SMSMessage.merchant.isnot(None),
+            SMSMessage.created_at >= lower,
+            SMSMessage.created_at < upper
+        ).group_by(SMSMessage.merchant).order_by(total.desc()).limit(limit).all()
+
+        return jsonify({
+            "merchants": [
+                {"merchant": m, "total": float(amt or 0), "count": n}
+                for m, amt, n in rows
+            ]
+        })
+
+    except Exception:
+        # Same format as Flask's unhandled-exception log (parsed by loadtest)
+        app.logger.exception("Exception on %s [%s]", request.path, request.method)
         return jsonify({"error": "Internal Server Error"}), 500
     finally:
         session.close()
+
+@app.route("/api/insights", methods=["GET", "OPTIONS"])
+def user_insights():
+    # Precomputed by the compute_insights batch job
+    if request.method == "OPTIONS": return jsonify({"status": "ok"}), 200
+    session = SessionLocal()
+    try:
+        user = require_auth(session)
+        if not user: return jsonify({"error": "Unauthorized"}), 401
+
+        row = session.query(UserInsight).filter_by(user_id=user.id).first()
+        if not row:
+            return jsonify({"recurring": [], "anomalies": [], "computed_at": None, "stale": True})
+
+        result = json.loads(row.payload)
+        result["computed_at"] = row.computed_at.isoformat() if row.computed_at else None
+        result["stale"] = row.data_version != (user.data_version or 0)
+        return jsonify(result)
+    finally:
+        session.close()
+
 if __name__ == "__main__":
     app.run(debug=True, host="0.0.0.0", port=5000)
\ No newline at end of file
@@ -1,12 +1,40 @@
 import bcrypt
+import os
+import threading
 import uuid
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import current_process, get_context
 
-def hash_password(password: str) -> str:
+# bcrypt cost factor for new hashes; existing hashes are upgraded on login
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "12"))
+
+# Password hashing runs in a separate process pool so CPU-bound bcrypt calls
+# can't starve request threads. 0 workers = run inline (dev/tests).
+# The pool is per server process: with gunicorn -w N there are N * HASH_POOL_SIZE
+# bcrypt workers, so keep that product at or below the number of cores.
+HASH_POOL_SIZE = int(os.environ.get("HASH_POOL_SIZE", "1"))
+# Jobs allowed to wait for a worker before new requests are rejected
+HASH_QUEUE_SIZE = int(os.environ.get("HASH_QUEUE_SIZE", str(4 * max(HASH_POOL_SIZE, 1))))
+HASH_TIMEOUT = float(os.environ.get("HASH_TIMEOUT", "10"))
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+_SLOTS = threading.BoundedSemaphore(HASH_POOL_SIZE + HASH_QUEUE_SIZE)
+
+
+class HashPoolBusy(Exception):
+    """
+    Raised when the hashing pool is saturated (caller should answer 503).
+    """
+
+
+def hash_password(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
     """
     Hash password using bcrypt.
     Stored format: bcrypt_hash (utf-8 string)
     """
-    hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
+    hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds))
     return hashed.decode("utf-8")
 
 
@@ -23,6 +51,133 @@ def verify_password(password: str, password_hash: str) -> bool:
         return False
 
 
+def hash_rounds(password_hash: str):
+    """
+    Cost factor of a stored bcrypt hash ("$2b$12$..." -> 12), or None.
+    """
+    try:
+        return int(password_hash.split("$")[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def needs_rehash(password_hash: str) -> bool:
+    return hash_rounds(password_hash) != BCRYPT_ROUNDS
+
+
+def _get_pool():
+    global _POOL
+
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                # spawn: forking a threaded server process is not safe.
+                # Spawned workers re-import the parent's __main__ (unless it is a
+                # package __main__), so run the app via `python -m expense_auditor`.
+                _POOL = ProcessPoolExecutor(max_workers=HASH_POOL_SIZE, mp_context=get_context("spawn"))
+    return _POOL
+
+
+def _stop_pool_before_fork():
+    # A process that forks after starting the pool is a master (gunicorn --preload):
+    # its pool would sit idle, and each forked worker starts its own on first use
+    global _POOL
+
+    pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _forget_pool():
+    global _POOL, _POOL_LOCK
+
+    _POOL = None
+    _POOL_LOCK = threading.Lock()
+
+
+os.register_at_fork(before=_stop_pool_before_fork, after_in_child=_forget_pool)
+
+
+def _ping():
+    return os.getpid()
+
+
+def start_hash_pool():
+    """
+    Start all hashing workers now instead of on the first login.
+    No-op when HASH_POOL_SIZE is 0, the pool is already running, or called
+    from a hashing worker that is re-importing the app.
+    """
+    if HASH_POOL_SIZE <= 0 or _POOL is not None or current_process().name != "MainProcess":
+        return
+    pool = _get_pool()
+    try:
+        # Workers are spawned on demand, one per queued job
+        jobs = [pool.submit(_ping) for _ in range(HASH_POOL_SIZE)]
+        for job in jobs:
+            job.result(timeout=HASH_TIMEOUT)
+    except FutureTimeout:
+        # Slow to spawn: the workers keep starting in the background
+        print("[WARN] Password hashing pool is slow to start")
+    except BrokenProcessPool as e:
+        # Don't fail app startup; _get_pool starts a fresh pool on first use
+        print("[WARN] Password hashing pool failed to start:", e)
+        _reset_pool(pool)
+
+
+def _reset_pool(broken):
+    # A worker died (e.g. OOM kill): drop the pool so the next call starts a fresh one
+    global _POOL
+
+    with _POOL_LOCK:
+        if _POOL is broken:
+            _POOL = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _run_pooled(fn, *args):
+    if HASH_POOL_SIZE <= 0:
+        return fn(*args)
+
+    if not _SLOTS.acquire(blocking=False):
+        raise HashPoolBusy("Password hashing pool is saturated")
+
+    try:
+        pool = _get_pool()
+        future = pool.submit(fn, *args)
+    except BrokenProcessPool:
+        _SLOTS.release()
+        _reset_pool(pool)
+        raise HashPoolBusy("Password hashing pool restarting")
+    except Exception:
+        _SLOTS.release()
+        raise
+    future.add_done_callback(lambda _: _SLOTS.release())
+
+    try:
+        return future.result(timeout=HASH_TIMEOUT)
+    except FutureTimeout:
+        future.cancel()
+        raise HashPoolBusy("Password hashing timed out")
+    except BrokenProcessPool:
+        _reset_pool(pool)
+        raise HashPoolBusy("Password hashing pool restarting")
+
+
+def pooled_hash_password(password: str) -> str:
+    """
+    hash_password on the hashing pool. Raises HashPoolBusy when saturated.
+    """
+    return _run_pooled(hash_password, password, BCRYPT_ROUNDS)
+
+
+def pooled_verify_password(password: str, password_hash: str) -> bool:
+    """
+    verify_password on the hashing pool. Raises HashPoolBusy when saturated.
+    """
+    return _run_pooled(verify_password, password, password_hash)
+
+
 def make_token() -> str:
     """
     Generate random session/token id.
@@ -0,0 +1,54 @@
+# src/expense_auditor/backfill_merchants.py
+import argparse
+from expense_auditor.db import SessionLocal, SMSMessage, User
+from expense_auditor.utils.merchant_extractor import extract_merchants
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill sms_messages.merchant for existing rows")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        last_id, scanned, filled = 0, 0, 0
+        while True:
+            # Keyset pagination: rows that stay NULL are not rescanned
+            rows = (
+                session.query(SMSMessage.id, SMSMessage.user_id, SMSMessage.text)
+                .filter(SMSMessage.merchant.is_(None), SMSMessage.id > last_id)
+                .order_by(SMSMessage.id)
+                .limit(args.batch_size)
+                .all()
+            )
+            if not rows:
+                break
+
+            ids, user_ids, texts = zip(*rows)
+            updates, touched = [], set()
+            for i, uid, m in zip(ids, user_ids, extract_merchants(texts)):
+                if m:
+                    updates.append({"id": i, "merchant": m})
+                    touched.add(uid)
+            if updates:
+                session.bulk_update_mappings(SMSMessage, updates)
+                # Invalidate cached summaries/insights of the users whose rows changed
+                session.query(User).filter(User.id.in_(touched)).update(
+                    {User.data_version: User.data_version + 1}, synchronize_session=False
+                )
+            session.commit()
+
+            last_id = ids[-1]
+            scanned += len(rows)
+            filled += len(updates)
+
+        print(f"Scanned {scanned} rows, set merchant on {filled}")
+    except Exception as e:
+        session.rollback()
+        print("ERROR:", e)
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
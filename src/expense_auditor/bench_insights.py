@@ -0,0 +1,86 @@
+# src/expense_auditor/bench_insights.py
+"""
+Benchmark recurring/anomaly detection on synthetic transaction series.
+
+Times one series of N transactions, then the same volume split across users
+and fanned out over worker processes like the compute_insights job.
+
+    python -m expense_auditor.bench_insights --transactions 1000000 --users 1000
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+from expense_auditor.insights import compute_insights, DAY
+
+START = 1_672_531_200  # 2023-01-01
+
+
+def synthetic_series(n, n_keys, seed=0, months=24):
+    """
+    ~10% of keys are monthly subscriptions (fixed amount, one payment a month);
+    the rest is irregular lognormal spend. 0.1% of amounts are inflated 20x.
+    """
+    rng = np.random.default_rng(seed)
+    n_subs = min(n_keys // 10, n // (2 * months))
+    sub_codes = np.repeat(np.arange(n_subs), months)
+    sub_ts = START + np.tile(np.arange(months), n_subs) * 30.44 * DAY + rng.normal(0, 0.5 * DAY, len(sub_codes))
+
+    n_other = n - len(sub_codes)
+    other_codes = rng.integers(n_subs, n_keys, n_other)
+    other_ts = START + rng.uniform(0, months * 30.44 * DAY, n_other)
+
+    codes = np.concatenate([sub_codes, other_codes])
+    ts = np.concatenate([sub_ts, other_ts])
+    base = np.exp(rng.normal(5, 1, n_keys))
+    jitter = np.concatenate([np.ones(len(sub_codes)), rng.lognormal(0, 0.3, n_other)])
+    amounts = base[codes] * jitter
+    spikes = rng.random(n) < 0.001
+    amounts[spikes] *= 20
+
+    return {
+        "ids": np.arange(n, dtype=np.int64),
+        "ts": ts,
+        "amounts": amounts,
+        "codes": codes.astype(np.int64),
+        "keys": np.array([f"merchant-{k}" for k in range(n_keys)], dtype=object),
+    }
+
+
+def _user_job(args):
+    n, n_keys, seed = args
+    result = compute_insights(synthetic_series(n, n_keys, seed))
+    return len(result["recurring"]), len(result["anomalies"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--transactions", type=int, default=1_000_000)
+    parser.add_argument("--keys", type=int, default=20_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    series = synthetic_series(args.transactions, args.keys)
+    start = time.perf_counter()
+    result = compute_insights(series)
+    elapsed = time.perf_counter() - start
+    print(f"single series: {args.transactions} tx, {args.keys} keys -> "
+          f"{len(result['recurring'])} recurring, {len(result['anomalies'])} anomalies in {elapsed:.2f}s")
+
+    per_user = args.transactions // args.users
+    keys_per_user = max(args.keys // args.users, 10)
+    jobs = [(per_user, keys_per_user, seed) for seed in range(args.users)]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=get_context("spawn")) as pool:
+        totals = np.array(list(pool.map(_user_job, jobs, chunksize=16))).sum(axis=0)
+    elapsed = time.perf_counter() - start
+    print(f"fan-out: {args.users} users x {per_user} tx on {args.workers} workers -> "
+          f"{totals[0]} recurring, {totals[1]} anomalies in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
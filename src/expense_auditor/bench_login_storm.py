@@ -0,0 +1,159 @@
+# src/expense_auditor/bench_login_storm.py
+"""
+Dashboard latency during a login storm, with bcrypt inline vs. on the pool.
+
+For each mode a threaded dev server is started on a scratch database.
+Dashboard readers hit /api/summary and /api/sms, first alone and then
+while login threads hammer /login.
+
+    python -m expense_auditor.bench_login_storm --seconds 10 --logins 16
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+SERVER = (
+    "from werkzeug.serving import run_simple;"
+    "from expense_auditor.app import app;"
+    "run_simple('127.0.0.1', {port}, app, threaded=True)"
+)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _request(url, method="GET", body=None, headers=None):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, method=method, headers=headers or {})
+    if data is not None:
+        req.add_header("Content-Type", "application/json")
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=60) as resp:
+            payload = resp.read()
+            status = resp.status
+    except urllib.error.HTTPError as e:
+        payload, status = e.read(), e.code
+    return time.perf_counter() - start, status, payload
+
+
+def _wait_ready(base, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if _request(f"{base}/health")[1] == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+def _seed(base):
+    _, _, payload = _request(f"{base}/api/auth/signup", "POST", {"email": "reader@example.com", "password": "pw"})
+    token = json.loads(payload)["token"]
+    _request(f"{base}/api/auth/signup", "POST", {"email": "storm@example.com", "password": "pw"})
+
+    rows = "text\n" + "\n".join(f"Rs {i} debited at Shop{i % 50} ref {i}" for i in range(500))
+    boundary = "benchboundary"
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"s.csv\"\r\n"
+        f"Content-Type: text/csv\r\n\r\n{rows}\r\n--{boundary}--\r\n"
+    ).encode()
+    req = urllib.request.Request(f"{base}/api/sms/upload", data=body, method="POST", headers={
+        "Authorization": f"Bearer {token}",
+        "Content-Type": f"multipart/form-data; boundary={boundary}",
+    })
+    urllib.request.urlopen(req, timeout=60).read()
+    return token
+
+
+def _loop(stop, fn, out):
+    while not stop.is_set():
+        out.append(fn())
+
+
+def _phase(base, token, seconds, readers, logins):
+    auth = {"Authorization": f"Bearer {token}"}
+    paths = ["/api/summary", "/api/sms"]
+    reads, login_results = [], []
+    stop = threading.Event()
+
+    def read():
+        path = paths[len(reads) % len(paths)]
+        return _request(f"{base}{path}", headers=auth)[:2]
+
+    def login():
+        return _request(f"{base}/login", "POST", {"email": "storm@example.com", "password": "pw"})[:2]
+
+    threads = [threading.Thread(target=_loop, args=(stop, read, reads)) for _ in range(readers)]
+    threads += [threading.Thread(target=_loop, args=(stop, login, login_results)) for _ in range(logins)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    lat = np.array([r[0] for r in reads]) * 1000
+    return {
+        "reads": len(reads),
+        "p50_ms": float(np.percentile(lat, 50)) if len(lat) else float("nan"),
+        "p99_ms": float(np.percentile(lat, 99)) if len(lat) else float("nan"),
+        "logins_ok": sum(1 for r in login_results if r[1] == 200),
+        "logins_503": sum(1 for r in login_results if r[1] == 503),
+    }
+
+
+def run_mode(name, pool_size, args):
+    workdir = tempfile.mkdtemp(prefix=f"login_storm_{name}_")
+    port = _free_port()
+    env = dict(os.environ, HASH_POOL_SIZE=str(pool_size), BCRYPT_ROUNDS=str(args.rounds))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.path.dirname(os.path.dirname(__file__)), env.get("PYTHONPATH")]))
+    server = subprocess.Popen(
+        [sys.executable, "-c", SERVER.format(port=port)],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        _wait_ready(base)
+        token = _seed(base)
+        quiet = _phase(base, token, args.seconds, args.readers, 0)
+        storm = _phase(base, token, args.seconds, args.readers, args.logins)
+    finally:
+        server.terminate()
+        server.wait()
+    return quiet, storm
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--logins", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--pool-size", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    args = parser.parse_args()
+
+    print(f"{args.readers} dashboard readers, {args.logins} login threads, bcrypt cost {args.rounds}")
+    print(f"{'mode':<8}{'phase':<8}{'reads':>8}{'p50 ms':>10}{'p99 ms':>10}{'login ok':>10}{'login 503':>11}")
+    for name, pool_size in [("inline", 0), ("pool", args.pool_size)]:
+        for phase, r in zip(("quiet", "storm"), run_mode(name, pool_size, args)):
+            print(f"{name:<8}{phase:<8}{r['reads']:>8}{r['p50_ms']:>10.1f}{r['p99_ms']:>10.1f}"
+                  f"{r['logins_ok']:>10}{r['logins_503']:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# src/expense_auditor/bench_model_artifacts.py
+"""
+Compare the default and compact model artifacts.
+
+Trains both pipelines on a synthetic SMS corpus, then reports artifact size,
+load time and per-worker memory when N fresh processes load the same file.
+
+    python -m expense_auditor.bench_model_artifacts --samples 50000 --workers 4
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from joblib import load
+from expense_auditor.train_classifier import build_pipeline, shrink_pipeline, save_model
+
+TEMPLATES = [
+    ("Rs. {amt} debited from A/c XX{acct} at {merchant} on {day}", "Expense"),
+    ("INR {amt} spent on card XX{acct} at {merchant} ref {ref}", "Expense"),
+    ("Rs {amt} credited to A/c XX{acct} by {merchant} ref {ref}", "Income"),
+    ("Refund of Rs {amt} from {merchant} credited ref {ref}", "Refund"),
+    ("{ref} is your OTP for {merchant} login. Do not share", "Account/Service"),
+]
+
+
+def synthetic_corpus(n, seed=0):
+    rnd = random.Random(seed)
+    merchants = [
+        " ".join(rnd.choice("abcdefghijklmnopqrstuvwxyz") * rnd.randint(3, 7) + str(i) for _ in range(2))
+        for i in range(max(n // 10, 50))
+    ]
+    texts, labels = [], []
+    for _ in range(n):
+        template, label = rnd.choice(TEMPLATES)
+        texts.append(template.format(
+            amt=rnd.randint(10, 50000),
+            acct=rnd.randint(1000, 9999),
+            merchant=rnd.choice(merchants),
+            day=f"{rnd.randint(1, 28):02d}-{rnd.randint(1, 12):02d}",
+            ref=rnd.randint(10 ** 5, 10 ** 9),
+        ))
+        labels.append(label)
+    return texts, labels
+
+
+def _memory_kb():
+    """
+    (private anonymous, file-backed) resident memory in kB.
+    File-backed pages (the mmapped arrays) are shared between workers.
+    """
+    fields = {}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in ("RssAnon", "RssFile"):
+                    fields[key] = int(value.split()[0])
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, 0
+    return fields.get("RssAnon", 0), fields.get("RssFile", 0)
+
+
+def _worker_load(path, mmap_mode):
+    # Exclude import cost from the measured delta
+    import sklearn.pipeline  # noqa: F401
+    import sklearn.feature_extraction.text  # noqa: F401
+    import sklearn.linear_model  # noqa: F401
+
+    anon0, file0 = _memory_kb()
+    start = time.perf_counter()
+    model = load(path, mmap_mode=mmap_mode)
+    model.predict_proba(["Rs. 250 debited at cafe"])
+    elapsed = time.perf_counter() - start
+    anon1, file1 = _memory_kb()
+    return elapsed, anon1 - anon0, file1 - file0
+
+
+def measure(path, workers, mmap_mode):
+    ctx = get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        results = list(pool.map(_worker_load, [path] * workers, [mmap_mode] * workers))
+    n = len(results)
+    return {
+        "size_mb": os.path.getsize(path) / 1e6,
+        "load_s": sum(r[0] for r in results) / n,
+        "private_mb": sum(r[1] for r in results) / n / 1024,
+        "shared_mb": sum(r[2] for r in results) / n / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--samples", type=int, default=50000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    texts, labels = synthetic_corpus(args.samples)
+    out_dir = tempfile.mkdtemp(prefix="model_bench_")
+
+    rows = []
+    for name, compact, mmap_mode in [
+        ("default", False, None),
+        ("default+mmap", False, "r"),
+        ("compact+mmap", True, "r"),
+    ]:
+        pipeline = build_pipeline(compact)
+        pipeline.fit(texts, labels)
+        if compact:
+            shrink_pipeline(pipeline)
+        path = os.path.join(out_dir, f"{name.split('+')[0]}.joblib")
+        save_model(pipeline, path)
+        rows.append((name, measure(path, args.workers, mmap_mode)))
+
+    print(f"{args.samples} samples, {args.workers} workers (per-worker averages)")
+    print(f"{'artifact':<14}{'size MB':>10}{'load s':>10}{'private MB':>12}{'shared MB':>11}")
+    for name, r in rows:
+        print(f"{name:<14}{r['size_mb']:>10.1f}{r['load_s']:>10.3f}{r['private_mb']:>12.1f}{r['shared_mb']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# src/expense_auditor/compute_insights.py
+"""
+Batch job: precompute recurring payments and anomalies for every user.
+
+Users are analysed in parallel worker processes (reads only); the parent
+process writes all results, so SQLite sees a single writer.
+
+    python -m expense_auditor.compute_insights --workers 4
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+
+from expense_auditor.db import init_db, SessionLocal, User, UserInsight
+from expense_auditor.insights import load_series, compute_insights
+
+
+def _analyse_user(user_id):
+    session = SessionLocal()
+    try:
+        version = session.query(User.data_version).filter(User.id == user_id).scalar() or 0
+        result = compute_insights(load_series(session, user_id))
+        return user_id, version, result
+    finally:
+        session.close()
+
+
+def save_insights(session, user_id, version, result):
+    row = session.query(UserInsight).filter_by(user_id=user_id).first()
+    if not row:
+        row = UserInsight(user_id=user_id)
+        session.add(row)
+    row.data_version = version
+    row.payload = json.dumps(result)
+    row.computed_at = datetime.utcnow()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute per-user insights")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--only-stale", action="store_true",
+                        help="Skip users whose insights match their current data_version")
+    args = parser.parse_args()
+
+    init_db()
+    session = SessionLocal()
+    try:
+        query = session.query(User.id)
+        if args.only_stale:
+            query = query.outerjoin(UserInsight, UserInsight.user_id == User.id).filter(
+                (UserInsight.id.is_(None)) | (UserInsight.data_version != User.data_version)
+            )
+        user_ids = [uid for (uid,) in query.all()]
+
+        if not user_ids:
+            print("No users to process.")
+            return
+
+        with ProcessPoolExecutor(max_workers=args.workers, mp_context=get_context("spawn")) as pool:
+            for user_id, version, result in pool.map(_analyse_user, user_ids, chunksize=8):
+                save_insights(session, user_id, version, result)
+
+        session.commit()
+        print(f"Computed insights for {len(user_ids)} users")
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
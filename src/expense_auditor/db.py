@@ -15,10 +15,10 @@ from sqlalchemy import (
 from sqlalchemy.orm import declarative_base, sessionmaker,relationship
 from datetime import datetime
 from sqlalchemy.sql import func
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import UniqueConstraint, Index
 
-DB_PATH = os.path.join("data", "expense_db.sqlite")
-os.makedirs("data", exist_ok=True)
+DB_PATH = os.environ.get("EXPENSE_DB_PATH", os.path.join("data", "expense_db.sqlite"))
+os.makedirs(os.path.dirname(DB_PATH) or ".", exist_ok=True)
 
 engine = create_engine(f"sqlite:///{DB_PATH}", echo=False)
 SessionLocal = sessionmaker(bind=engine)
@@ -33,6 +33,7 @@ class SMSMessage(Base):
     text = Column(String, nullable=False)
     amount = Column(Float, nullable=True)
     category = Column(String, nullable=False)
+    merchant = Column(String, nullable=True)  # utils/merchant_extractor.py
     corrected = Column(Boolean, default=False)
     confidence = Column(Float, nullable=True)          
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -41,6 +42,7 @@ class SMSMessage(Base):
 
     __table_args__ = (
         UniqueConstraint("user_id", "text", "amount", name="uq_user_sms"),
+        Index("idx_sms_user_merchant", "user_id", "merchant"),
     )
 class User(Base):
     __tablename__ = "users"
@@ -53,6 +55,9 @@ class User(Base):
     # NEW:
     is_admin = Column(Boolean, default=False, nullable=False)
 
+    # Bumped whenever the user's SMS data changes (cache key for summaries)
+    data_version = Column(Integer, default=0, nullable=False)
+
 
 
 
@@ -67,6 +72,8 @@ class UserSettings(Base):
     highlight_low_confidence = Column(Boolean, default=True)
     confidence_threshold = Column(Float, default=0.7)
     auto_retrain = Column(Boolean, default=False)
+    # Manual corrections since the last retrain (reset by train_and_save)
+    pending_corrections = Column(Integer, default=0, nullable=False)
 
     user = relationship("User", backref="settings")
 
@@ -81,6 +88,15 @@ class Budget(Base):
 
     user = relationship("User", backref="budgets")
 
+class UserInsight(Base):
+    __tablename__ = "user_insights"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), unique=True, nullable=False)
+    data_version = Column(Integer, default=0, nullable=False)  # User.data_version at compute time
+    payload = Column(Text, nullable=False)  # JSON: {"recurring": [...], "anomalies": [...]}
+    computed_at = Column(DateTime, default=datetime.utcnow)
+
 
 def init_db():
     Base.metadata.create_all(bind=engine)
@@ -2,6 +2,7 @@
 import pandas as pd
 from expense_auditor.db import init_db, SessionLocal, SMSMessage
 from expense_auditor.utils.amount_extractor import extract_amount
+from expense_auditor.utils.merchant_extractor import extract_merchants
 
 CSV_PATH = "auto_dataset_from_sms.csv"
 
@@ -15,6 +16,7 @@ def main():
         print(f"Loaded {len(df)} rows from {CSV_PATH}")
 
         inserted = 0
+        df["merchant"] = extract_merchants(df["source_text"])
 
         for _, row in df.iterrows():
             text = row["source_text"]
@@ -30,6 +32,7 @@ def main():
                 text=text,
                 amount=amount,
                 category=row.get("category", "Unknown"),
+                merchant=row["merchant"],
                 corrected=False,
             )
 
@@ -0,0 +1,208 @@
+# src/expense_auditor/insights.py
+"""
+Recurring-payment and anomaly detection over a user's expense series.
+
+Series are columnar (NumPy arrays) and every statistic is computed per key
+(merchant, or SMS template when no merchant was extracted) with sort + reduce operations, never a Python loop per
+transaction or per key.
+"""
+import numpy as np
+from sqlalchemy import func, DateTime
+from expense_auditor.db import SMSMessage
+from expense_auditor.utils.sms_template import template_key
+
+DAY = 86400.0
+
+# Recurring: at least this many payments (3 intervals), spaced >= MIN_PERIOD_DAYS apart.
+# Every interval must be within MAX_INTERVAL_DEVIATION of the median interval
+# (MAD alone is too noisy over a handful of intervals), and the amount MAD
+# within MAX_AMOUNT_DEVIATION of the median amount.
+MIN_RECURRING = 4
+MIN_PERIOD_DAYS = 6
+MAX_INTERVAL_DEVIATION = 0.15
+MAX_AMOUNT_DEVIATION = 0.10
+
+# Anomaly: modified z-score (Iglewicz & Hoaglin) above threshold.
+# Keys with fewer than MIN_GROUP_SIZE samples are scored against the user's
+# overall spend instead.
+ANOMALY_Z = 3.5
+MIN_GROUP_SIZE = 5
+
+PERIODS = {"weekly": 7, "monthly": 30.44, "quarterly": 91.31, "yearly": 365.25}
+
+
+def load_series(session, user_id):
+    """
+    Fetch a user's expenses as columnar arrays:
+    ids, ts (epoch seconds), amounts, codes (int per key) and keys (code -> key).
+    """
+    ts_col = func.coalesce(SMSMessage.date, SMSMessage.created_at, type_=DateTime)
+    rows = session.query(
+        SMSMessage.id, ts_col, SMSMessage.amount, SMSMessage.text, SMSMessage.merchant
+    ).filter(
+        SMSMessage.user_id == user_id,
+        SMSMessage.category == "Expense",
+        SMSMessage.amount.isnot(None),
+        ts_col.isnot(None)
+    ).all()
+
+    if not rows:
+        empty = np.array([], dtype=np.int64)
+        return {"ids": empty, "ts": empty.astype(float), "amounts": empty.astype(float),
+                "codes": empty, "keys": np.array([], dtype=object)}
+
+    ids, stamps, amounts, texts, merchants = zip(*rows)
+    # Merchant when known, otherwise the SMS template
+    raw_keys = [m or template_key(t) for t, m in zip(texts, merchants)]
+    keys, codes = np.unique(np.array(raw_keys, dtype=object), return_inverse=True)
+    return {
+        "ids": np.array(ids, dtype=np.int64),
+        "ts": np.array(stamps, dtype="datetime64[s]").astype(np.int64).astype(float),
+        "amounts": np.array(amounts, dtype=float),
+        "codes": codes.astype(np.int64),
+        "keys": keys,
+    }
+
+
+def _group_starts(sorted_codes):
+    n = len(sorted_codes)
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]]) if n else np.array([], dtype=np.int64)
+    counts = np.diff(np.r_[starts, n])
+    return starts, counts
+
+
+def group_median(values, codes, n_groups):
+    """
+    Median of values per group code; NaN for groups with no values.
+    """
+    out = np.full(n_groups, np.nan)
+    if len(values) == 0:
+        return out
+    order = np.lexsort((values, codes))
+    v, g = values[order], codes[order]
+    starts, counts = _group_starts(g)
+    lo = starts + (counts - 1) // 2
+    hi = starts + counts // 2
+    out[g[starts]] = (v[lo] + v[hi]) / 2
+    return out
+
+
+def group_max(values, codes, n_groups):
+    """
+    Max of values per group code; NaN for groups with no values.
+    """
+    out = np.full(n_groups, np.nan)
+    if len(values) == 0:
+        return out
+    order = np.argsort(codes, kind="stable")
+    v, g = values[order], codes[order]
+    starts, _ = _group_starts(g)
+    out[g[starts]] = np.maximum.reduceat(v, starts)
+    return out
+
+
+def group_mad(values, codes, n_groups, medians=None):
+    """
+    Median absolute deviation per group code.
+    """
+    if medians is None:
+        medians = group_median(values, codes, n_groups)
+    return group_median(np.abs(values - medians[codes]), codes, n_groups)
+
+
+def _period_label(days):
+    names = np.array(list(PERIODS))
+    targets = np.array(list(PERIODS.values()))
+    rel = np.abs(days[:, None] - targets[None, :]) / targets[None, :]
+    best = rel.argmin(axis=1)
+    return np.where(rel[np.arange(len(days)), best] <= 0.2, names[best], "custom")
+
+
+def detect_recurring(series):
+    """
+    Keys whose payments arrive at regular intervals with stable amounts.
+    """
+    ts, amounts, codes, keys = series["ts"], series["amounts"], series["codes"], series["keys"]
+    n_groups = len(keys)
+    if len(ts) < MIN_RECURRING:
+        return []
+
+    order = np.lexsort((ts, codes))
+    ts_s, codes_s = ts[order], codes[order]
+
+    same = codes_s[1:] == codes_s[:-1]
+    intervals = (np.diff(ts_s) / DAY)[same]
+    interval_codes = codes_s[1:][same]
+
+    count = np.bincount(codes, minlength=n_groups)
+    period = group_median(intervals, interval_codes, n_groups)
+    period_dev = group_max(np.abs(intervals - period[interval_codes]), interval_codes, n_groups)
+    amount = group_median(amounts, codes, n_groups)
+    amount_mad = group_mad(amounts, codes, n_groups, amount)
+
+    last_ts = np.full(n_groups, np.nan)
+    starts, counts = _group_starts(codes_s)
+    last_ts[codes_s[starts]] = ts_s[starts + counts - 1]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        regular = (
+            (count >= MIN_RECURRING)
+            & (period >= MIN_PERIOD_DAYS)
+            & (period_dev <= MAX_INTERVAL_DEVIATION * period)
+            & (amount_mad <= MAX_AMOUNT_DEVIATION * np.abs(amount))
+        )
+    hits = np.flatnonzero(regular)
+    labels = _period_label(period[hits])
+    next_ts = last_ts[hits] + period[hits] * DAY
+
+    return [{
+        "key": str(keys[g]),
+        "count": int(count[g]),
+        "period_days": round(float(period[g]), 1),
+        "period": str(label),
+        "amount": round(float(amount[g]), 2),
+        "next_expected": np.datetime64(int(nxt), "s").item().isoformat(),
+    } for g, label, nxt in zip(hits, labels, next_ts)]
+
+
+def detect_anomalies(series):
+    """
+    Transactions whose amount is far from the typical amount for their key.
+    """
+    ids, amounts, codes, keys = series["ids"], series["amounts"], series["codes"], series["keys"]
+    n_groups = len(keys)
+    if len(amounts) < MIN_GROUP_SIZE:
+        return []
+
+    # Log scale keeps the scores meaningful for skewed spend distributions
+    values = np.log1p(np.abs(amounts))
+    count = np.bincount(codes, minlength=n_groups)
+    median = group_median(values, codes, n_groups)
+    mad = group_mad(values, codes, n_groups, median)
+
+    overall_median = np.median(values)
+    overall_mad = np.median(np.abs(values - overall_median))
+    small = count < MIN_GROUP_SIZE
+    median[small] = overall_median
+    mad[small] = overall_mad
+
+    # Flat series (MAD 0) would flag any deviation; floor at ~5% of the amount
+    mad = np.maximum(mad, 0.05)
+    z = 0.6745 * (values - median[codes]) / mad[codes]
+    flagged = np.flatnonzero(np.abs(z) > ANOMALY_Z)
+
+    typical = np.expm1(median[codes[flagged]])
+    return [{
+        "id": int(ids[i]),
+        "key": str(keys[codes[i]]),
+        "amount": float(amounts[i]),
+        "typical_amount": round(float(t), 2),
+        "score": round(float(z[i]), 2),
+    } for i, t in zip(flagged, typical)]
+
+
+def compute_insights(series):
+    return {
+        "recurring": detect_recurring(series),
+        "anomalies": detect_anomalies(series),
+    }
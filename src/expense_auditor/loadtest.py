@@ -0,0 +1,392 @@
+# src/expense_auditor/loadtest.py
+"""
+End-to-end load test against a local stand-in deployment.
+
+Starts the app under gunicorn (N worker processes) on a scratch SQLite
+database, seeds synthetic users and messages, then drives a weighted mix of
+uploads, listing, summary, corrections and logins from concurrent clients.
+Reports throughput, p50/p95/p99 latency and errors per endpoint (including
+"database is locked") and saves the results as JSON for comparing commits.
+
+    pip install gunicorn   # optional; falls back to the threaded dev server
+    python -m expense_auditor.loadtest --workers 4 --concurrency 32 --duration 30
+    python -m expense_auditor.loadtest --compare data/loadtest/<previous>.json
+"""
+import argparse
+import json
+import os
+import random
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timedelta
+
+import numpy as np
+
+DEFAULT_MIX = "list=35,summary=20,trends=10,correct=15,upload=10,login=10"
+RESULTS_DIR = os.path.join("data", "loadtest")
+LOCKED = "database is locked"
+
+# Path in a logged "Exception on <path> [METHOD]" line -> endpoint name
+ENDPOINT_PATHS = [
+    (re.compile(r"^/api/sms/upload$"), "upload"),
+    (re.compile(r"^/api/sms/\d+$"), "correct"),
+    (re.compile(r"^/api/sms$"), "list"),
+    (re.compile(r"^/api/summary/trends$"), "trends"),
+    (re.compile(r"^/api/summary$"), "summary"),
+    (re.compile(r"^/login$"), "login"),
+]
+LOGGED_EXCEPTION = re.compile(r"Exception on (\S+) \[\w+\]")
+
+
+# --------------------------------------------------
+# Stand-in deployment
+# --------------------------------------------------
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def seed(workdir, users, messages, rounds, seed_value=0):
+    """
+    Create users (shared password "loadtest") and messages directly in the
+    scratch DB. Returns [(email, token, [message ids])].
+    """
+    # Read by db.py at import, here and in the server process started later
+    os.environ["EXPENSE_DB_PATH"] = os.path.join(workdir, "data", "expense_db.sqlite")
+    from expense_auditor.db import init_db, SessionLocal, User, UserSettings, SMSMessage
+    from expense_auditor.auth_utils import hash_password, make_token
+    from expense_auditor.utils.merchant_extractor import extract_merchant
+
+    init_db()
+    rnd = random.Random(seed_value)
+    password_hash = hash_password("loadtest", rounds=rounds)
+    merchants = ["swiggy.stores@axisbank", "zomato@paytm", "netflix@hdfc", "uber@icici", "bigbasket@ybl"]
+    now = datetime.utcnow()
+
+    session = SessionLocal()
+    try:
+        accounts = []
+        for u in range(users):
+            user = User(email=f"user{u}@loadtest.local", password_hash=password_hash, token=make_token())
+            session.add(user)
+            session.flush()
+            session.add(UserSettings(user_id=user.id))
+
+            rows = []
+            for m in range(messages):
+                amount = rnd.randint(10, 5000)
+                income = rnd.random() < 0.1
+                text = (f"Rs {amount} credited to A/c XX{u % 10000:04d} ref {m}" if income
+                        else f"Rs {amount} debited from A/c XX{u % 10000:04d} to VPA {rnd.choice(merchants)} ref {m}")
+                rows.append({
+                    "user_id": user.id,
+                    "text": text,
+                    "amount": float(amount),
+                    "category": "Income" if income else "Expense",
+                    "merchant": None if income else extract_merchant(text),
+                    "corrected": False,
+                    "confidence": 0.95,
+                    "created_at": now - timedelta(days=rnd.randint(0, 365)),
+                })
+            session.bulk_insert_mappings(SMSMessage, rows)
+            accounts.append((user.email, user.token, user.id))
+        session.commit()
+
+        ids = {}
+        for msg_id, user_id in session.query(SMSMessage.id, SMSMessage.user_id):
+            ids.setdefault(user_id, []).append(msg_id)
+        return [(email, token, ids.get(uid, [])) for email, token, uid in accounts]
+    finally:
+        session.close()
+
+
+def start_server(workdir, port, args, log_path):
+    # Unbuffered so the log is complete when locked_from_log reads it
+    env = dict(os.environ, BCRYPT_ROUNDS=str(args.rounds), PYTHONUNBUFFERED="1")
+    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src_dir, env.get("PYTHONPATH")]))
+
+    if args.server == "gunicorn":
+        cmd = [
+            sys.executable, "-m", "gunicorn",
+            "-w", str(args.workers), "--threads", str(args.threads),
+            "-b", f"127.0.0.1:{port}", "--timeout", "120",
+            "expense_auditor.app:app",
+        ]
+    else:
+        cmd = [sys.executable, "-c", (
+            "from werkzeug.serving import run_simple;"
+            "from expense_auditor.app import app;"
+            f"run_simple('127.0.0.1', {port}, app, threaded=True)"
+        )]
+
+    log = open(log_path, "w")
+    proc = subprocess.Popen(cmd, cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT)
+    proc.log_file = log
+    return proc
+
+
+def wait_ready(base, proc, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("server exited during startup; see server log")
+        try:
+            with urllib.request.urlopen(f"{base}/health", timeout=2) as resp:
+                if resp.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not become ready")
+
+
+# --------------------------------------------------
+# Scenarios
+# --------------------------------------------------
+
+def _call(url, method="GET", token=None, body=None, content_type="application/json"):
+    headers = {}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    if body is not None:
+        headers["Content-Type"] = content_type
+    req = urllib.request.Request(url, data=body, method=method, headers=headers)
+    try:
+        with urllib.request.urlopen(req, timeout=120) as resp:
+            return resp.status, resp.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+def _upload_body(user_index, counter):
+    boundary = "loadtestboundary"
+    rows = "\n".join(
+        f"Rs {random.randint(10, 5000)} debited at Store{i} ref u{user_index}-{counter}-{i}"
+        for i in range(20)
+    )
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"sms.csv\"\r\n"
+        f"Content-Type: text/csv\r\n\r\ntext\n{rows}\r\n--{boundary}--\r\n"
+    ).encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def run_scenario(name, base, account, index, counter):
+    email, token, ids = account
+    if name == "list":
+        return _call(f"{base}/api/sms", token=token)
+    if name == "summary":
+        return _call(f"{base}/api/summary", token=token)
+    if name == "trends":
+        return _call(f"{base}/api/summary/trends", token=token)
+    if name == "correct":
+        sms_id = random.choice(ids) if ids else 0
+        body = json.dumps({"category": random.choice(["Expense", "Income", "Refund"])}).encode()
+        return _call(f"{base}/api/sms/{sms_id}", "PUT", token, body)
+    if name == "upload":
+        body, content_type = _upload_body(index, counter)
+        return _call(f"{base}/api/sms/upload", "POST", token, body, content_type)
+    if name == "login":
+        body = json.dumps({"email": email, "password": "loadtest"}).encode()
+        return _call(f"{base}/login", "POST", body=body)
+    raise ValueError(f"unknown scenario {name}")
+
+
+def parse_mix(mix):
+    names, weights = [], []
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        names.append(name.strip())
+        weights.append(float(weight or 1))
+    return names, weights
+
+
+def drive(base, accounts, args):
+    names, weights = parse_mix(args.mix)
+    samples = []  # (scenario, latency_s, status, locked)
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def client(worker_id):
+        rnd = random.Random(worker_id)
+        counter = 0
+        local = []
+        while not stop.is_set():
+            name = rnd.choices(names, weights)[0]
+            index = rnd.randrange(len(accounts))
+            counter += 1
+            start = time.perf_counter()
+            try:
+                status, body = run_scenario(name, base, accounts[index], index, f"{worker_id}-{counter}")
+            except OSError as e:
+                status, body = 0, str(e).encode()
+            local.append((name, time.perf_counter() - start, status, LOCKED.encode() in body))
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(args.concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(args.duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    return samples, time.perf_counter() - start
+
+
+# --------------------------------------------------
+# Reporting
+# --------------------------------------------------
+
+def locked_from_log(log_path):
+    """
+    Count logged tracebacks ending in "database is locked", per endpoint.
+    """
+    counts = {}
+    with open(log_path, errors="replace") as f:
+        blocks = LOGGED_EXCEPTION.split(f.read())
+    # split() yields [prefix, path1, block1, path2, block2, ...]
+    for path, block in zip(blocks[1::2], blocks[2::2]):
+        if LOCKED in block:
+            name = next((n for p, n in ENDPOINT_PATHS if p.match(path)), path)
+            counts[name] = counts.get(name, 0) + 1
+    return counts
+
+
+def summarize(samples, elapsed, log_locked):
+    report = {}
+    for name in sorted({s[0] for s in samples}):
+        rows = [s for s in samples if s[0] == name]
+        lat = np.array([r[1] for r in rows]) * 1000
+        statuses = {}
+        for r in rows:
+            statuses[str(r[2])] = statuses.get(str(r[2]), 0) + 1
+        errors = sum(1 for r in rows if r[2] == 0 or r[2] >= 500)
+        report[name] = {
+            "requests": len(rows),
+            "rps": len(rows) / elapsed,
+            "p50_ms": float(np.percentile(lat, 50)),
+            "p95_ms": float(np.percentile(lat, 95)),
+            "p99_ms": float(np.percentile(lat, 99)),
+            "error_rate": errors / len(rows),
+            "db_locked": sum(1 for r in rows if r[3]) + log_locked.get(name, 0),
+            "statuses": statuses,
+        }
+    return report
+
+
+def print_report(report, previous=None):
+    header = f"{'endpoint':<10}{'reqs':>7}{'rps':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'err %':>7}{'locked':>8}"
+    if previous:
+        header += f"{'Δp99 ms':>10}{'Δrps':>8}"
+    print(header)
+    for name, r in report.items():
+        line = (f"{name:<10}{r['requests']:>7}{r['rps']:>8.1f}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}"
+                f"{r['p99_ms']:>9.1f}{r['error_rate'] * 100:>7.1f}{r['db_locked']:>8}")
+        if previous:
+            old = previous.get(name)
+            if old:
+                line += f"{r['p99_ms'] - old['p99_ms']:>+10.1f}{r['rps'] - old['rps']:>+8.1f}"
+        print(line)
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def save_results(results, out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+    path = os.path.join(out_dir, f"{stamp}_{results['commit'] or 'nogit'}.json")
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end load test on a scratch deployment")
+    parser.add_argument("--server", choices=["gunicorn", "werkzeug"], default=None,
+                        help="default: gunicorn if installed, else the threaded dev server")
+    parser.add_argument("--workers", type=int, default=4, help="gunicorn worker processes")
+    parser.add_argument("--threads", type=int, default=1, help="threads per gunicorn worker")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--messages", type=int, default=200, help="seeded messages per user")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients")
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"scenario weights (default {DEFAULT_MIX})")
+    parser.add_argument("--rounds", type=int, default=10, help="bcrypt cost for seeded users and the server")
+    parser.add_argument("--out", default=RESULTS_DIR)
+    parser.add_argument("--compare", help="previous results JSON to diff against")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch directory")
+    args = parser.parse_args()
+
+    if args.server is None:
+        try:
+            import gunicorn  # noqa: F401
+            args.server = "gunicorn"
+        except ImportError:
+            print("[WARN] gunicorn not installed; using the single-process dev server")
+            args.server = "werkzeug"
+
+    workdir = tempfile.mkdtemp(prefix="expense_loadtest_")
+    log_path = os.path.join(workdir, "server.log")
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    proc = None
+    try:
+        print(f"Seeding {args.users} users x {args.messages} messages in {workdir}")
+        accounts = seed(workdir, args.users, args.messages, args.rounds)
+
+        proc = start_server(workdir, port, args, log_path)
+        wait_ready(base, proc)
+        print(f"Driving {args.concurrency} clients for {args.duration:.0f}s against "
+              f"{args.server}" + (f" ({args.workers} workers)" if args.server == "gunicorn" else ""))
+        samples, elapsed = drive(base, accounts, args)
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait()
+            proc.log_file.close()
+
+    report = summarize(samples, elapsed, locked_from_log(log_path))
+    results = {
+        "commit": _git_commit(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("out", "compare", "keep")},
+        "total_rps": len(samples) / elapsed,
+        "endpoints": report,
+    }
+
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)["endpoints"]
+
+    print_report(report, previous)
+    print(f"total: {results['total_rps']:.1f} req/s")
+    print(f"Saved {save_results(results, args.out)}")
+
+    if args.keep:
+        print(f"Scratch deployment kept in {workdir}")
+    else:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+# src/expense_auditor/migrate_add_data_version.py
+from sqlalchemy import text
+from expense_auditor.db import engine
+
+def main():
+    with engine.connect() as conn:
+        try:
+            conn.execute(text("ALTER TABLE users ADD COLUMN data_version INTEGER NOT NULL DEFAULT 0"))
+            conn.commit()
+            print("✅ Column 'data_version' added to users table")
+        except Exception as e:
+            print("⚠️ Migration skipped or already applied:", e)
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_sms_user_id ON sms_messages (user_id)",
     "CREATE INDEX IF NOT EXISTS idx_sms_user_created ON sms_messages (user_id, created_at)",
     "CREATE INDEX IF NOT EXISTS idx_sms_user_category ON sms_messages (user_id, category)",
+    "CREATE INDEX IF NOT EXISTS idx_sms_user_merchant ON sms_messages (user_id, merchant)",
 ]
 
 
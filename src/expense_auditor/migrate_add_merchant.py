@@ -0,0 +1,20 @@
+# src/expense_auditor/migrate_add_merchant.py
+from sqlalchemy import text
+from expense_auditor.db import engine
+
+def main():
+    with engine.connect() as conn:
+        try:
+            conn.execute(text("ALTER TABLE sms_messages ADD COLUMN merchant TEXT"))
+            conn.commit()
+            print("✅ Column 'merchant' added to sms_messages table")
+        except Exception as e:
+            print("⚠️ Migration skipped or already applied:", e)
+
+        conn.execute(text("CREATE INDEX IF NOT EXISTS idx_sms_user_merchant ON sms_messages (user_id, merchant)"))
+        conn.commit()
+
+    print("Run `python -m expense_auditor.backfill_merchants` to fill existing rows")
+
+if __name__ == "__main__":
+    main()
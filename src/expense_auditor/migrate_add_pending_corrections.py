@@ -0,0 +1,15 @@
+# src/expense_auditor/migrate_add_pending_corrections.py
+from sqlalchemy import text
+from expense_auditor.db import engine
+
+def main():
+    with engine.connect() as conn:
+        try:
+            conn.execute(text("ALTER TABLE user_settings ADD COLUMN pending_corrections INTEGER NOT NULL DEFAULT 0"))
+            conn.commit()
+            print("✅ Column 'pending_corrections' added to user_settings table")
+        except Exception as e:
+            print("⚠️ Migration skipped or already applied:", e)
+
+if __name__ == "__main__":
+    main()
@@ -19,7 +19,9 @@ def load_model(force_reload: bool = False):
         return None
 
     try:
-        _MODEL = load(MODEL_PATH)
+        # Numeric arrays are mapped read-only, so prefork workers share them
+        # through the page cache instead of each holding a private copy.
+        _MODEL = load(MODEL_PATH, mmap_mode="r")
         print("[INFO] ML model loaded")
         return _MODEL
     except Exception as e:
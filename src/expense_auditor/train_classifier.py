@@ -1,14 +1,74 @@
 import os
+import numpy as np
 import pandas as pd
 from sklearn.pipeline import Pipeline
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer, TfidfTransformer
 from sklearn.linear_model import LogisticRegression
 from joblib import dump
-from expense_auditor.db import SessionLocal, SMSMessage
+from expense_auditor.db import SessionLocal, SMSMessage, UserSettings
 
 MODEL_PATH = os.path.join("models", "category_model.joblib")
 
-def train_and_save():
+# Compact artifacts: hashed features (no vocabulary dict) and float32 weights,
+# so every array in the pickle can be memory-mapped and shared across workers.
+COMPACT_MODEL = os.environ.get("COMPACT_MODEL", "0") == "1"
+# Hash buckets; dense weights cost n_classes * HASH_FEATURES * 4 bytes
+HASH_FEATURES = int(os.environ.get("MODEL_HASH_FEATURES", str(2 ** 16)))
+
+
+def build_pipeline(compact: bool = False) -> Pipeline:
+    clf = LogisticRegression(max_iter=1000, class_weight="balanced")
+
+    if not compact:
+        return Pipeline([
+            ("tfidf", TfidfVectorizer(ngram_range=(1, 2), stop_words="english")),
+            ("clf", clf),
+        ])
+
+    return Pipeline([
+        ("hash", HashingVectorizer(
+            ngram_range=(1, 2),
+            stop_words="english",
+            n_features=HASH_FEATURES,
+            alternate_sign=False,
+            norm=None,
+            dtype=np.float32,
+        )),
+        ("tfidf", TfidfTransformer()),
+        ("clf", clf),
+    ])
+
+
+def shrink_pipeline(pipeline: Pipeline) -> Pipeline:
+    """
+    Downcast fitted weights to float32 to halve their size on disk and in memory.
+    Buckets never seen in training keep a zero weight, so on small corpora the
+    coefficients are stored sparse (8 bytes per non-zero vs 4 per bucket).
+    """
+    clf = pipeline.named_steps["clf"]
+    clf.coef_ = clf.coef_.astype(np.float32)
+    clf.intercept_ = clf.intercept_.astype(np.float32)
+    if np.count_nonzero(clf.coef_) < clf.coef_.size // 2:
+        clf.sparsify()
+
+    tfidf = pipeline.named_steps.get("tfidf")
+    if isinstance(tfidf, TfidfTransformer):
+        tfidf.idf_ = tfidf.idf_.astype(np.float32)
+    return pipeline
+
+
+def save_model(pipeline: Pipeline, path: str = MODEL_PATH):
+    """
+    Dump uncompressed (required for mmap_mode) and swap the file in atomically,
+    so workers that still map the old artifact are not affected.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    dump(pipeline, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def train_and_save(compact: bool = COMPACT_MODEL):
     session = SessionLocal()
     try:
         # 1. Fetch all data from DB to train (including manual corrections)
@@ -30,20 +90,18 @@ def train_and_save():
         X = df["text"]
         y = df["category"]
 
-        pipeline = Pipeline([
-            ("tfidf", TfidfVectorizer(ngram_range=(1, 2), stop_words="english")),
-            ("clf", LogisticRegression(max_iter=1000, class_weight="balanced")),
-        ])
-
+        pipeline = build_pipeline(compact)
         pipeline.fit(X, y)
+        if compact:
+            shrink_pipeline(pipeline)
 
         # 3. Save Model
-        os.makedirs("models", exist_ok=True)
-        dump(pipeline, MODEL_PATH)
+        save_model(pipeline, MODEL_PATH)
 
         # 4. Reset 'corrected' flags in DB
         # This makes the "New corrections" count on the dashboard go to 0
         session.query(SMSMessage).filter(SMSMessage.corrected == True).update({"corrected": False})
+        session.query(UserSettings).update({"pending_corrections": 0})
         session.commit()
 
         print(f"Model retrained and saved to {MODEL_PATH}")
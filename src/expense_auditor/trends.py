@@ -0,0 +1,111 @@
+# src/expense_auditor/trends.py
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import func
+from expense_auditor.db import SMSMessage
+
+MAX_MONTHS = 60
+# datetime supports years 1..9999; month_bounds needs the month after `end`
+MIN_YEAR, MAX_YEAR = 1, 9998
+_CACHE_SIZE = 256
+_CACHE = OrderedDict()
+
+
+def parse_month(value: str) -> Optional[Tuple[int, int]]:
+    """
+    Parse "YYYY-MM" into (year, month).
+    Returns None if the value is malformed or out of range.
+    """
+    try:
+        year, month = map(int, value.split("-"))
+    except (ValueError, AttributeError):
+        return None
+    if not 1 <= month <= 12 or not MIN_YEAR <= year <= MAX_YEAR:
+        return None
+    return year, month
+
+
+def month_span(start: Tuple[int, int], end: Tuple[int, int]):
+    """
+    List of "YYYY-MM" keys from start to end (inclusive).
+    """
+    year, month = start
+    keys = []
+    while (year, month) <= end:
+        keys.append(f"{year}-{month:02d}")
+        month += 1
+        if month > 12:
+            year, month = year + 1, 1
+    return keys
+
+
+def month_bounds(start: Tuple[int, int], end: Tuple[int, int]):
+    """
+    [lower, upper) datetimes covering start..end (inclusive) months.
+    """
+    lower = datetime(start[0], start[1], 1)
+    upper = datetime(end[0] + end[1] // 12, end[1] % 12 + 1, 1)
+    return lower, upper
+
+
+def build_trends(months, rows):
+    """
+    Turn (month, category, total) rows into a filled month series.
+    Months without data are reported with zero totals.
+    """
+    by_month = {m: {} for m in months}
+    for month, cat, amt in rows:
+        if month in by_month:
+            by_month[month][cat] = float(amt or 0)
+
+    series = []
+    running_net = 0.0
+    for month in months:
+        by_category = by_month[month]
+        income = by_category.get("Income", 0.0)
+        expense = sum((v for c, v in by_category.items() if c != "Income"), 0.0)
+        net = income - expense
+        running_net += net
+        series.append({
+            "month": month,
+            "total_income": income,
+            "total_expense": expense,
+            "net": net,
+            "running_net": running_net,
+            "by_category": by_category,
+        })
+    return series
+
+
+def monthly_trends(session, user, start, end):
+    """
+    Per-month totals for user between start and end (inclusive).
+    One grouped query over (user_id, created_at); results are cached
+    until the user's data_version changes.
+    """
+    key = (user.id, user.data_version or 0, start, end)
+    if key in _CACHE:
+        _CACHE.move_to_end(key)
+        return _CACHE[key]
+
+    lower, upper = month_bounds(start, end)
+    month_col = func.strftime("%Y-%m", SMSMessage.created_at)
+
+    rows = session.query(
+        month_col,
+        SMSMessage.category,
+        func.sum(SMSMessage.amount)
+    ).filter(
+        SMSMessage.user_id == user.id,
+        SMSMessage.created_at >= lower,
+        SMSMessage.created_at < upper
+    ).group_by(month_col, SMSMessage.category).all()
+
+    result = build_trends(month_span(start, end), rows)
+
+    _CACHE[key] = result
+    if len(_CACHE) > _CACHE_SIZE:
+        _CACHE.popitem(last=False)
+    return result
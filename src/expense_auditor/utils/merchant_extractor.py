@@ -0,0 +1,119 @@
+# utils/merchant_extractor.py
+import re
+from typing import Iterable, List, Optional
+
+# Tried in order; the first pattern that yields a usable name wins.
+MERCHANT_PATTERNS = [
+    # UPI: "paid to swiggy.stores@axisbank", "to VPA zomato-order@paytm"
+    re.compile(r"\bto\s+(?:vpa\s+)?([\w.\-]+)@[a-z]+", re.IGNORECASE),
+    # "Info: AMAZON PAY INDIA" / "Info-UPI/NETFLIX"
+    re.compile(r"\binfo\s*[:\-]\s*(?:upi/|pos/|ach/)?([^\n.,;]+?)(?=\s+(?:on|ref|avl|avbl|bal)\b|[\n.,;]|$)", re.IGNORECASE),
+    # "spent Rs 250 at STARBUCKS COFFEE on 12-03"
+    re.compile(r"\bat\s+([a-z][\w&'*. \-]*?)(?=\s+(?:on|is|via|ref|using|for|txn|avl|avbl|bal|upi)\b|[,;]|\.\s|\.$|$)", re.IGNORECASE),
+    # "paid to Ramesh Kumar", "transferred to BESCOM"
+    re.compile(r"\b(?:paid|sent|transferred|payment)\s+to\s+([a-z][\w&'. \-]*?)(?=\s+(?:on|via|ref|using|for|from|txn|upi)\b|[,;]|\.\s|\.$|$)", re.IGNORECASE),
+    # "Sent Rs.100.00 From HDFC Bank A/C *1234 To ZOMATO On 12/03/24"
+    re.compile(r"\b(?:rs|inr)\.?\s*[\d,]+(?:\.\d+)?\b[^\n]*?\bto\s+([a-z][\w&'. \-]*?)(?=\s+on\b)", re.IGNORECASE),
+    # Credits: "Rs 25000 credited to A/c XX12 by ACME CORP", "... credited from Rahul"
+    re.compile(r"\bcredited\b[^.]*?\b(?:from|by)\s+([a-z][\w&'. \-]*?)(?=\s+(?:on|via|ref|using|for|txn|upi)\b|[,;]|\.\s|\.$|$)", re.IGNORECASE),
+]
+
+URL = re.compile(r"^\s*(?:https?://|www\.)", re.IGNORECASE)
+NON_WORD = re.compile(r"[^a-z0-9&]+")
+DOMAIN = re.compile(r"\.(?:com|in|co|net|org)\b")
+TRAILING_DIGITS = re.compile(r"\d+$")
+
+NOISE_TOKENS = {
+    "pvt", "ltd", "private", "limited", "india", "ind", "llp", "inc", "www",
+    "the", "store", "stores", "online", "payments", "payment", "pay", "upi", "pos",
+}
+
+# Leading words of account references rather than counterparties ("your a/c", "card xx12")
+NOT_MERCHANTS = {"a", "ac", "acct", "account", "your", "you", "card", "atm", "bank", "self"}
+
+# The sending bank itself ("Visit us at www.hdfcbank.com", "login at HDFC NetBanking")
+BANK_NAMES = {
+    "hdfc", "hdfcbank", "icici", "icicibank", "sbi", "sbibank", "axis", "axisbank",
+    "kotak", "kotakbank", "pnb", "canara", "idfc", "idfcbank", "indusind", "yesbank",
+}
+
+# Normalized token -> display name
+MERCHANT_ALIASES = {
+    "amazon": "Amazon",
+    "amzn": "Amazon",
+    "flipkart": "Flipkart",
+    "fkrt": "Flipkart",
+    "swiggy": "Swiggy",
+    "bundl": "Swiggy",
+    "zomato": "Zomato",
+    "uber": "Uber",
+    "ola": "Ola",
+    "olacabs": "Ola",
+    "irctc": "IRCTC",
+    "netflix": "Netflix",
+    "spotify": "Spotify",
+    "bigbasket": "BigBasket",
+    "myntra": "Myntra",
+    "paytm": "Paytm",
+    "phonepe": "PhonePe",
+    "airtel": "Airtel",
+    "jio": "Jio",
+    "starbucks": "Starbucks",
+    "dmart": "DMart",
+}
+
+
+def normalize_merchant(raw: str) -> Optional[str]:
+    """
+    Clean a raw merchant string and map it to a canonical name.
+    "AMAZON PAY INDIA PVT LTD" -> "Amazon", "ramesh.kumar99" -> "Ramesh Kumar"
+    """
+    if not raw or URL.match(raw):
+        return None
+
+    t = DOMAIN.sub(" ", raw.lower())
+    tokens = [
+        tok for tok in NON_WORD.sub(" ", t).split()
+        if tok not in NOISE_TOKENS and not tok.isdigit()
+    ]
+    tokens = [TRAILING_DIGITS.sub("", tok) or tok for tok in tokens][:4]
+    if not tokens or tokens[0] in NOT_MERCHANTS or tokens[0] in BANK_NAMES:
+        return None
+
+    for tok in tokens:
+        if tok in MERCHANT_ALIASES:
+            return MERCHANT_ALIASES[tok]
+
+    name = " ".join(tok.capitalize() for tok in tokens)
+    return name if len(name) >= 2 else None
+
+
+def extract_merchant(text: str) -> Optional[str]:
+    """
+    Extract the merchant / counterparty name from SMS text.
+    Returns normalized name or None.
+    """
+    if not text:
+        return None
+
+    for pattern in MERCHANT_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            name = normalize_merchant(match.group(1))
+            if name:
+                return name
+
+    return None
+
+
+def extract_merchants(texts: Iterable[str]) -> List[Optional[str]]:
+    """
+    Batch version of extract_merchant; repeated texts are parsed once.
+    """
+    seen = {}
+    out = []
+    for text in texts:
+        if text not in seen:
+            seen[text] = extract_merchant(text)
+        out.append(seen[text])
+    return out
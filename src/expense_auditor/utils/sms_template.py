@@ -0,0 +1,38 @@
+# utils/sms_template.py
+import re
+
+DIGITS = re.compile(r"\d+")
+
+
+def template_key(text: str) -> str:
+    """
+    Reduce an SMS to its template by masking digit runs.
+    "Rs. 500 debited from A/c XX1234" -> "rs. # debited from a/c xx#"
+    """
+    if not text:
+        return ""
+    return DIGITS.sub("#", text.strip().lower())
+
+
+def exact_template(text: str) -> str:
+    """
+    Case-sensitive template: only digit runs are masked.
+    Two messages share it iff they differ only in their numbers.
+    """
+    if not text:
+        return ""
+    return DIGITS.sub("#", text.strip())
+
+
+def template_like_pattern(text: str, escape: str = "\\") -> str:
+    """
+    SQL LIKE prefilter for messages sharing text's template.
+    Digit runs become '%', literal '%' / '_' are escaped. '%' matches any text
+    and SQLite's LIKE ignores case, so confirm rows with exact_template().
+    """
+    parts = DIGITS.split(text.strip())
+    literal = [
+        p.replace(escape, escape * 2).replace("%", escape + "%").replace("_", escape + "_")
+        for p in parts
+    ]
+    return "%".join(literal)
@@ -0,0 +1,52 @@
+# tests/conftest.py
+import os
+import tempfile
+
+# Hash inline: importing the app must not start a process pool
+os.environ.setdefault("HASH_POOL_SIZE", "0")
+# Importing the app runs init_db(): keep it off ./data/expense_db.sqlite
+os.environ.setdefault("EXPENSE_DB_PATH", os.path.join(tempfile.mkdtemp(), "expense_db.sqlite"))
+
+import pytest
+from sqlalchemy import create_engine
+
+from expense_auditor import auth_utils
+from expense_auditor.db import Base, SessionLocal, User, UserSettings
+
+
+@pytest.fixture
+def db(tmp_path):
+    """
+    Point SessionLocal at a scratch SQLite file for the duration of a test.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.sqlite'}")
+    Base.metadata.create_all(bind=engine)
+    original = SessionLocal.kw["bind"]
+    SessionLocal.configure(bind=engine)
+    yield SessionLocal
+    SessionLocal.configure(bind=original)
+    engine.dispose()
+
+
+@pytest.fixture
+def client(db, monkeypatch):
+    monkeypatch.setattr(auth_utils, "HASH_POOL_SIZE", 0)
+    monkeypatch.setattr(auth_utils, "BCRYPT_ROUNDS", 4)
+    from expense_auditor.app import app
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user(db):
+    def _make(email):
+        session = db()
+        try:
+            user = User(email=email, password_hash="x", token=f"token-{email}")
+            session.add(user)
+            session.flush()
+            session.add(UserSettings(user_id=user.id))
+            session.commit()
+            return user.id, {"Authorization": f"Bearer {user.token}"}
+        finally:
+            session.close()
+    return _make
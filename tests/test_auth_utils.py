@@ -0,0 +1,100 @@
+# tests/test_auth_utils.py
+import os
+import threading
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from expense_auditor import auth_utils
+from expense_auditor.auth_utils import hash_password, verify_password, hash_rounds, needs_rehash
+
+
+def test_hash_and_verify():
+    h = hash_password("secret", rounds=4)
+    assert verify_password("secret", h)
+    assert not verify_password("wrong", h)
+
+
+def test_hash_rounds():
+    assert hash_rounds(hash_password("secret", rounds=5)) == 5
+    assert hash_rounds("not-a-hash") is None
+
+
+def test_needs_rehash_on_cost_change():
+    h = hash_password("secret", rounds=4)
+    assert needs_rehash(h) == (auth_utils.BCRYPT_ROUNDS != 4)
+
+
+def test_saturated_pool_raises_busy(monkeypatch):
+    slots = threading.BoundedSemaphore(1)
+    slots.acquire()
+    monkeypatch.setattr(auth_utils, "HASH_POOL_SIZE", 1)
+    monkeypatch.setattr(auth_utils, "_SLOTS", slots)
+
+    with pytest.raises(auth_utils.HashPoolBusy):
+        auth_utils.pooled_verify_password("secret", "$2b$04$invalid")
+
+
+def test_start_hash_pool_spawns_workers(monkeypatch):
+    monkeypatch.setattr(auth_utils, "HASH_POOL_SIZE", 2)
+    monkeypatch.setattr(auth_utils, "_POOL", None)
+    try:
+        auth_utils.start_hash_pool()
+        pool = auth_utils._POOL
+        assert pool is not None
+        assert len(pool._processes) == 2
+
+        auth_utils.start_hash_pool()
+        assert auth_utils._POOL is pool
+
+        h = hash_password("secret", rounds=4)
+        assert auth_utils.pooled_verify_password("secret", h)
+    finally:
+        if auth_utils._POOL is not None:
+            auth_utils._POOL.shutdown()
+
+
+def test_start_hash_pool_inline_is_noop(monkeypatch):
+    monkeypatch.setattr(auth_utils, "HASH_POOL_SIZE", 0)
+    monkeypatch.setattr(auth_utils, "_POOL", None)
+    auth_utils.start_hash_pool()
+    assert auth_utils._POOL is None
+
+
+
+def test_start_hash_pool_survives_broken_workers(monkeypatch):
+    class BrokenPool:
+        def submit(self, fn):
+            future = Future()
+            future.set_exception(BrokenProcessPool("worker died"))
+            return future
+
+        def shutdown(self, **kwargs):
+            pass
+
+    def get_pool():
+        auth_utils._POOL = BrokenPool()
+        return auth_utils._POOL
+
+    monkeypatch.setattr(auth_utils, "HASH_POOL_SIZE", 1)
+    monkeypatch.setattr(auth_utils, "_POOL", None)
+    monkeypatch.setattr(auth_utils, "_get_pool", get_pool)
+
+    auth_utils.start_hash_pool()
+    assert auth_utils._POOL is None
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_fork_stops_parent_pool(monkeypatch):
+    monkeypatch.setattr(auth_utils, "HASH_POOL_SIZE", 1)
+    monkeypatch.setattr(auth_utils, "_POOL", None)
+    auth_utils.start_hash_pool()
+    assert auth_utils._POOL is not None
+
+    pid = os.fork()
+    if pid == 0:
+        os._exit(0 if auth_utils._POOL is None else 1)
+    _, status = os.waitpid(pid, 0)
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert auth_utils._POOL is None
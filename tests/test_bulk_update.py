@@ -0,0 +1,113 @@
+# tests/test_bulk_update.py
+import pytest
+from expense_auditor.app import BULK_CHUNK
+from expense_auditor.db import SMSMessage, UserSettings
+
+
+def _add_messages(db, user_id, texts):
+    session = db()
+    try:
+        rows = [SMSMessage(user_id=user_id, text=t, amount=float(i), category="Unknown") for i, t in enumerate(texts)]
+        session.add_all(rows)
+        session.commit()
+        return [r.id for r in rows]
+    finally:
+        session.close()
+
+
+def _categories(db, user_id):
+    session = db()
+    try:
+        return {m.text: m.category for m in session.query(SMSMessage).filter_by(user_id=user_id)}
+    finally:
+        session.close()
+
+
+def _pending(db, user_id):
+    session = db()
+    try:
+        return session.query(UserSettings.pending_corrections).filter_by(user_id=user_id).scalar()
+    finally:
+        session.close()
+
+
+def test_update_by_ids_across_chunks(client, db, make_user):
+    user_id, headers = make_user("a@example.com")
+    ids = _add_messages(db, user_id, [f"Rs {i} debited" for i in range(BULK_CHUNK + 5)])
+
+    resp = client.patch("/api/sms/bulk", json={"ids": ids, "category": "Expense"}, headers=headers)
+
+    assert resp.get_json() == {"updated": BULK_CHUNK + 5}
+    assert set(_categories(db, user_id).values()) == {"Expense"}
+
+
+def test_template_filter_matches_only_numbers(client, db, make_user):
+    user_id, headers = make_user("a@example.com")
+    other_id, _ = make_user("b@example.com")
+    _add_messages(db, user_id, [
+        "Rs. 10 debited from A/c XX1234",
+        "Rs. 2500 debited from A/c XX99",
+        "Rs. abc debited from A/c XXhello world",
+        "rs. 7 DEBITED FROM a/c xx9",
+    ])
+    _add_messages(db, other_id, ["Rs. 10 debited from A/c XX1234"])
+
+    resp = client.patch("/api/sms/bulk", json={
+        "filter": {"template": "Rs. 1 debited from A/c XX2"}, "category": "Refund",
+    }, headers=headers)
+
+    assert resp.get_json() == {"updated": 2}
+    assert _categories(db, user_id) == {
+        "Rs. 10 debited from A/c XX1234": "Refund",
+        "Rs. 2500 debited from A/c XX99": "Refund",
+        "Rs. abc debited from A/c XXhello world": "Unknown",
+        "rs. 7 DEBITED FROM a/c xx9": "Unknown",
+    }
+    assert set(_categories(db, other_id).values()) == {"Unknown"}
+
+
+def test_text_contains_filter_is_scoped_to_user(client, db, make_user):
+    user_id, headers = make_user("a@example.com")
+    other_id, _ = make_user("b@example.com")
+    _add_messages(db, user_id, ["Paid 50% at Swiggy", "Paid at Zomato"])
+    _add_messages(db, other_id, ["Paid 50% at Swiggy"])
+
+    resp = client.patch("/api/sms/bulk", json={
+        "filter": {"text_contains": "50%"}, "category": "Expense",
+    }, headers=headers)
+
+    assert resp.get_json() == {"updated": 1}
+    assert _categories(db, user_id)["Paid at Zomato"] == "Unknown"
+    assert set(_categories(db, other_id).values()) == {"Unknown"}
+
+
+def test_pending_corrections_counted_per_user(client, db, make_user):
+    user_id, headers = make_user("a@example.com")
+    other_id, _ = make_user("b@example.com")
+    ids = _add_messages(db, user_id, ["one 1", "two 2", "three 3"])
+
+    client.patch("/api/sms/bulk", json={"ids": ids, "category": "Expense"}, headers=headers)
+    client.put(f"/api/sms/{ids[0]}", json={"category": "Income"}, headers=headers)
+
+    assert _pending(db, user_id) == 4
+    assert _pending(db, other_id) == 0
+
+
+@pytest.mark.parametrize("body", [
+    {"ids": [1]},
+    {"ids": [1], "category": None},
+    {"ids": [1], "category": 5},
+    {"ids": [1], "amount": "100"},
+    {"ids": [1], "amount": True},
+    {"ids": "1", "category": "Expense"},
+    {"ids": [1], "filter": {"category": "Unknown"}, "category": "Expense"},
+    {"category": "Expense"},
+    {"filter": {}, "category": "Expense"},
+    {"filter": {"template": 5}, "category": "Expense"},
+    {"filter": {"text_contains": ["x"]}, "category": "Expense"},
+    {"filter": {"merchant": "Amazon"}, "category": "Expense"},
+])
+def test_invalid_requests_rejected(client, make_user, body):
+    _, headers = make_user("a@example.com")
+    resp = client.patch("/api/sms/bulk", json=body, headers=headers)
+    assert resp.status_code == 400
@@ -0,0 +1,56 @@
+# tests/test_insights.py
+import numpy as np
+from expense_auditor.insights import group_median, detect_recurring, detect_anomalies, DAY
+
+
+def _series(codes, days, amounts, keys):
+    return {
+        "ids": np.arange(len(codes), dtype=np.int64),
+        "ts": np.array(days, dtype=float) * DAY,
+        "amounts": np.array(amounts, dtype=float),
+        "codes": np.array(codes, dtype=np.int64),
+        "keys": np.array(keys, dtype=object),
+    }
+
+
+def test_group_median():
+    values = np.array([5.0, 1.0, 3.0, 10.0, 20.0])
+    codes = np.array([0, 0, 0, 2, 2])
+    med = group_median(values, codes, 3)
+    assert med[0] == 3.0
+    assert np.isnan(med[1])
+    assert med[2] == 15.0
+
+
+def test_detects_monthly_subscription_only():
+    series = _series(
+        codes=[0, 0, 0, 0, 1, 1, 1, 1],
+        days=[0, 30, 61, 91, 0, 2, 40, 41],
+        amounts=[199, 199, 199, 199, 50, 300, 20, 75],
+        keys=["netflix", "swiggy"],
+    )
+    found = detect_recurring(series)
+    assert [r["key"] for r in found] == ["netflix"]
+    assert found[0]["period"] == "monthly"
+
+
+def test_flags_outlier_amount():
+    series = _series(
+        codes=[0] * 6,
+        days=range(6),
+        amounts=[100, 110, 95, 105, 102, 4000],
+        keys=["swiggy"],
+    )
+    flagged = detect_anomalies(series)
+    assert [a["id"] for a in flagged] == [5]
+
+
+def test_sparse_irregular_keys_not_flagged():
+    # Three intervals that happen to have a tight MAD, plus one far-off gap
+    series = _series(
+        codes=[0, 0, 0, 0, 1, 1, 1],
+        days=[0, 30, 60, 140, 0, 30, 60],
+        amounts=[99, 99, 99, 99, 49, 49, 49],
+        keys=["irregular", "too_few"],
+    )
+    assert detect_recurring(series) == []
@@ -0,0 +1,44 @@
+# tests/test_loadtest.py
+from sqlalchemy.exc import OperationalError
+
+from expense_auditor import app as app_module
+from expense_auditor.loadtest import parse_mix, locked_from_log
+
+LOG = """[2026-01-01 10:00:00,000] ERROR in app: Exception on /api/sms/upload [POST]
+Traceback (most recent call last):
+sqlite3.OperationalError: database is locked
+[2026-01-01 10:00:01,000] ERROR in app: Exception on /api/sms/42 [PUT]
+Traceback (most recent call last):
+sqlalchemy.exc.OperationalError: (sqlite3.OperationalError) database is locked
+[2026-01-01 10:00:02,000] ERROR in app: Exception on /api/sms [GET]
+Traceback (most recent call last):
+KeyError: 'file'
+[2026-01-01 10:00:03,000] ERROR in app: Exception on /api/summary [GET]
+Traceback (most recent call last):
+sqlite3.OperationalError: database is locked
+"""
+
+
+def test_parse_mix():
+    assert parse_mix("list=3, login=1") == (["list", "login"], [3.0, 1.0])
+
+
+def test_locked_from_log(tmp_path):
+    path = tmp_path / "server.log"
+    path.write_text(LOG)
+    assert locked_from_log(str(path)) == {"upload": 1, "correct": 1, "summary": 1}
+
+
+def test_handled_lock_error_is_logged(client, make_user, monkeypatch, caplog, tmp_path):
+    _, headers = make_user("a@example.com")
+
+    def locked(*args):
+        raise OperationalError("SELECT", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(app_module, "monthly_trends", locked)
+    resp = client.get("/api/summary/trends", headers=headers)
+    assert resp.status_code == 500
+
+    path = tmp_path / "server.log"
+    path.write_text(caplog.text)
+    assert locked_from_log(str(path)) == {"trends": 1}
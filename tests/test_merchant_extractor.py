@@ -0,0 +1,44 @@
+# tests/test_merchant_extractor.py
+from expense_auditor.utils.merchant_extractor import extract_merchant, extract_merchants
+
+
+def test_at_merchant():
+    assert extract_merchant("INR 250 spent on card XX1234 at STARBUCKS COFFEE on 12-03") == "Starbucks"
+
+
+def test_upi_vpa():
+    assert extract_merchant("Rs 120 debited from A/c XX1234 to VPA swiggy.stores@axisbank") == "Swiggy"
+
+
+def test_info_field():
+    assert extract_merchant("Rs 1,250 debited from A/c XX9 Info: UPI/ZOMATO LTD/123") == "Zomato"
+
+
+def test_alias():
+    assert extract_merchant("Rs 300 spent at AMZN Mktp IN on 2024") == "Amazon"
+
+
+def test_person_vpa():
+    assert extract_merchant("Rs.500 sent to ramesh.kumar99@okicici") == "Ramesh Kumar"
+
+
+def test_account_reference_is_not_merchant():
+    assert extract_merchant("Rs 100 credited to your a/c by your card") is None
+
+
+def test_no_merchant():
+    assert extract_merchant("OTP for login is 123456") is None
+
+
+def test_bank_boilerplate_is_not_merchant():
+    assert extract_merchant("Rs 300 debited. Visit us at www.hdfcbank.com") is None
+    assert extract_merchant("Your OTP for login at HDFC NetBanking is 123456") is None
+
+
+def test_to_name_on_after_amount():
+    text = "Sent Rs.100.00 From HDFC Bank A/C *1234 To ZOMATO On 12/03/24 Ref 412345678901"
+    assert extract_merchant(text) == "Zomato"
+
+
+def test_batch():
+    assert extract_merchants(["Rs. 499.50 paid to Amazon", "", "Rs. 499.50 paid to Amazon"]) == ["Amazon", None, "Amazon"]
@@ -0,0 +1,47 @@
+# tests/test_merchant_ingestion.py
+import io
+
+from expense_auditor import backfill_merchants
+from expense_auditor.db import SMSMessage, User
+
+
+def test_upload_fills_merchant(client, db, make_user):
+    user_id, headers = make_user("a@example.com")
+    csv_data = b"text\nRs 120 debited to VPA swiggy.stores@axisbank\nOTP for login is 123456\n"
+
+    resp = client.post("/api/sms/upload", data={"file": (io.BytesIO(csv_data), "sms.csv")}, headers=headers)
+
+    assert resp.get_json() == {"inserted": 2}
+    session = db()
+    try:
+        merchants = {m.text: m.merchant for m in session.query(SMSMessage).filter_by(user_id=user_id)}
+    finally:
+        session.close()
+    assert merchants == {
+        "Rs 120 debited to VPA swiggy.stores@axisbank": "Swiggy",
+        "OTP for login is 123456": None,
+    }
+
+
+def test_backfill_bumps_only_updated_users(db, make_user, monkeypatch):
+    filled_id, _ = make_user("a@example.com")
+    untouched_id, _ = make_user("b@example.com")
+    session = db()
+    session.add_all([
+        SMSMessage(user_id=filled_id, text="Rs 99 paid to Amazon", amount=99, category="Expense"),
+        SMSMessage(user_id=untouched_id, text="OTP for login is 1234", amount=None, category="Account/Service"),
+    ])
+    session.commit()
+    session.close()
+
+    monkeypatch.setattr("sys.argv", ["backfill_merchants"])
+    backfill_merchants.main()
+
+    session = db()
+    try:
+        versions = dict(session.query(User.id, User.data_version))
+        merchant = session.query(SMSMessage.merchant).filter_by(user_id=filled_id).scalar()
+    finally:
+        session.close()
+    assert merchant == "Amazon"
+    assert versions == {filled_id: 1, untouched_id: 0}
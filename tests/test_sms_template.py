@@ -0,0 +1,23 @@
+# tests/test_sms_template.py
+from expense_auditor.utils.sms_template import template_key, exact_template, template_like_pattern
+
+
+def test_template_key_masks_digits():
+    assert template_key("Rs. 500 debited from A/c XX1234") == "rs. # debited from a/c xx#"
+
+
+def test_same_template_same_key():
+    assert template_key("Rs. 20 paid") == template_key("Rs. 99999 paid")
+
+
+def test_like_pattern_replaces_digits():
+    assert template_like_pattern("Rs. 500 debited from A/c XX1234") == "Rs. % debited from A/c XX%"
+
+
+def test_like_pattern_escapes_wildcards():
+    assert template_like_pattern("50%_off on 2") == "%\\%\\_off on %"
+
+
+def test_exact_template_is_case_sensitive():
+    assert exact_template("Rs. 5 paid") == exact_template("Rs. 7000 paid")
+    assert exact_template("Rs. 5 paid") != exact_template("rs. 5 PAID")
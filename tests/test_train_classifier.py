@@ -0,0 +1,27 @@
+# tests/test_train_classifier.py
+import numpy as np
+from scipy import sparse
+from joblib import load
+from expense_auditor.train_classifier import build_pipeline, shrink_pipeline, save_model
+
+TEXTS = [
+    "Rs. 500 debited at Amazon",
+    "INR 120 spent at Swiggy",
+    "Rs 25000 salary credited",
+    "INR 900 credited by Acme Corp",
+]
+LABELS = ["Expense", "Expense", "Income", "Income"]
+
+
+def test_compact_model_round_trip_with_mmap(tmp_path):
+    pipeline = shrink_pipeline(build_pipeline(compact=True).fit(TEXTS, LABELS))
+    path = str(tmp_path / "model.joblib")
+    save_model(pipeline, path)
+
+    model = load(path, mmap_mode="r")
+    coef = model.named_steps["clf"].coef_
+    # Tiny corpus: most hash buckets are unused, so weights are stored sparse
+    assert sparse.issparse(coef)
+    assert coef.dtype == np.float32
+    assert isinstance(coef.data, np.memmap)
+    assert model.predict(["Rs. 300 debited at Amazon"])[0] == "Expense"
@@ -0,0 +1,112 @@
+# tests/test_trends.py
+from collections import OrderedDict
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+from expense_auditor import trends
+from expense_auditor.db import SMSMessage
+from expense_auditor.trends import parse_month, month_span, build_trends, MAX_MONTHS
+
+
+def test_parse_month():
+    assert parse_month("2024-03") == (2024, 3)
+
+
+def test_parse_month_invalid():
+    assert parse_month("2024-13") is None
+    assert parse_month("march") is None
+
+
+def test_month_span_crosses_year():
+    assert month_span((2023, 11), (2024, 2)) == ["2023-11", "2023-12", "2024-01", "2024-02"]
+
+
+def test_build_trends_fills_missing_months():
+    rows = [
+        ("2024-01", "Income", 1000.0),
+        ("2024-01", "Expense", 400.0),
+        ("2024-03", "Expense", 100.0),
+    ]
+    series = build_trends(["2024-01", "2024-02", "2024-03"], rows)
+
+    assert [m["net"] for m in series] == [600.0, 0.0, -100.0]
+    assert [m["running_net"] for m in series] == [600.0, 600.0, 500.0]
+    assert series[1]["by_category"] == {}
+
+
+def test_parse_month_rejects_out_of_range_years():
+    assert parse_month("0000-01") is None
+    assert parse_month("9999-12") is None
+    assert parse_month("9998-12") == (9998, 12)
+
+
+@pytest.fixture
+def trend_queries(db, monkeypatch):
+    """
+    Fresh trends cache (user ids repeat across scratch DBs); collects the
+    grouped month queries sent to the DB.
+    """
+    monkeypatch.setattr(trends, "_CACHE", OrderedDict())
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        if "strftime" in statement:
+            statements.append(statement)
+
+    engine = db.kw["bind"]
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def _add(db, user_id, rows):
+    session = db()
+    try:
+        msgs = [
+            SMSMessage(user_id=user_id, text=f"Rs {amount}", amount=amount, category=category, created_at=created_at)
+            for created_at, category, amount in rows
+        ]
+        session.add_all(msgs)
+        session.commit()
+        return [m.id for m in msgs]
+    finally:
+        session.close()
+
+
+def test_trends_endpoint_reflects_corrections(client, db, make_user, trend_queries):
+    user_id, headers = make_user("a@example.com")
+    expense_id, _ = _add(db, user_id, [
+        (datetime(2024, 1, 10), "Expense", 400.0),
+        (datetime(2024, 2, 5), "Income", 1000.0),
+    ])
+    url = "/api/summary/trends?from=2024-01&to=2024-03"
+
+    months = client.get(url, headers=headers).get_json()["months"]
+    assert [m["month"] for m in months] == ["2024-01", "2024-02", "2024-03"]
+    assert [m["net"] for m in months] == [-400.0, 1000.0, 0.0]
+    assert len(trend_queries) == 1
+    assert "GROUP BY" in trend_queries[0]
+
+    # Unchanged data is served from the cache
+    client.get(url, headers=headers)
+    assert len(trend_queries) == 1
+
+    resp = client.put(f"/api/sms/{expense_id}", json={"category": "Income"}, headers=headers)
+    assert resp.status_code == 200
+
+    months = client.get(url, headers=headers).get_json()["months"]
+    assert [m["net"] for m in months] == [400.0, 1000.0, 0.0]
+    assert months[0]["by_category"] == {"Income": 400.0}
+    assert len(trend_queries) == 2
+
+
+def test_trends_endpoint_rejects_bad_ranges(client, make_user, trend_queries):
+    _, headers = make_user("a@example.com")
+
+    assert client.get("/api/summary/trends?from=2024-03&to=2024-01", headers=headers).status_code == 400
+    assert client.get("/api/summary/trends?from=2024-13&to=2025-01", headers=headers).status_code == 400
+    too_long = f"/api/summary/trends?from=2000-01&to={2000 + MAX_MONTHS // 12}-01"
+    assert client.get(too_long, headers=headers).status_code == 400
+    assert trend_queries == []